@@ -9,34 +9,120 @@ multiple Reddit API endpoints and sorting methods to get older posts.
 import os
 import sys
 import logging
+import logging.handlers
+import operator
+import queue
+import threading
 import time
-import requests
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import psycopg2
 
 # Add src directory to path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.database import Database
-from src.reddit_client import RedditClient
-from src.models import RedditPost
+from src.database import Database, POST_COLUMNS
+from src.reddit_client import RedditClient, PERMALINK_PREFIX
 from src.config import load_environment, get_config_from_env
+from src.bloom_filter import BloomFilter
+from src.recent_ids import RecentIds
+
+
+# Stop paging hot posts after this many consecutive posts at or before the stored watermark
+STALE_POST_LIMIT = 25
+
+# Reddit listing fields read by extract_insert_tuple, in POST_COLUMNS order
+_LISTING_DEFAULTS = {
+    'id': '',
+    'title': '',
+    'author': '[deleted]',
+    'created_utc': 0,
+    'score': 0,
+    'num_comments': 0,
+    'url': '',
+    'selftext': '',
+    'permalink': '',
+    'subreddit': ''
+}
+_LISTING_FIELDS = operator.itemgetter(*_LISTING_DEFAULTS)
+
+# Positions of the fields the backfill reads back out of insert rows
+_POST_ID, _TITLE, _CREATED_UTC = (POST_COLUMNS.index(column) for column in ('post_id', 'title', 'created_utc'))
+
+
+def extract_insert_tuple(data: Dict[str, Any]) -> Tuple:
+    """
+    Map raw Reddit post data straight to an insert row.
+
+    Args:
+        data: The 'data' object of a t3 listing child
+
+    Returns:
+        Tuple of post values in POST_COLUMNS order
+    """
+    try:
+        post_id, title, author, created_utc, score, num_comments, url, selftext, permalink, subreddit = _LISTING_FIELDS(data)
+    except KeyError:
+        # Listings nearly always carry every field; only fill defaults when one is missing
+        post_id, title, author, created_utc, score, num_comments, url, selftext, permalink, subreddit = \
+            _LISTING_FIELDS({**_LISTING_DEFAULTS, **data})
+
+    return (
+        post_id,
+        title,
+        author,
+        int(created_utc),
+        score,
+        num_comments,
+        url,
+        selftext,
+        PERMALINK_PREFIX + permalink if permalink else '',
+        subreddit
+    )
+
+
+@lru_cache(maxsize=64)
+def _listing_url(base_url: str, subreddit: str, kind: str) -> str:
+    """Build (and cache) the JSON listing URL for a subreddit sort."""
+    return f"{base_url}/r/{subreddit}/{kind}.json"
+
+
+class HistoricalBackfillClient(RedditClient):
+    """Reddit client extended with the paginated listings used for historical collection."""
+
+    def __init__(self, user_agent: str = None, max_concurrency: int = 4):
+        super().__init__(user_agent or 'RedditHistoricalBackfill/1.0', max_concurrency=max_concurrency)
+        # Cap in-flight requests when several methods/subreddits are fetched in parallel
+        self.in_flight = threading.BoundedSemaphore(self.max_concurrency)
+
+    def _fetch_listing(self, url: str, params: Dict[str, Any]) -> Tuple[List[Tuple], Optional[str]]:
+        """
+        Fetch one listing page.
 
+        Args:
+            url: Listing URL from _listing_url()
+            params: Query parameters
+
+        Returns:
+            Post rows in POST_COLUMNS order and the next pagination token
+        """
+        self.rate_limiter.acquire()
+        with self.in_flight:
+            response = self.session.get(url, params=params, timeout=30)
+        self.rate_limiter.update_from_headers(response.headers)
+        response.raise_for_status()
 
-class HistoricalBackfillClient:
-    """Extended Reddit client for historical data collection."""
+        data = orjson.loads(response.content)
+        if 'data' not in data or 'children' not in data['data']:
+            return [], None
 
-    def __init__(self, user_agent: str = None):
-        self.user_agent = user_agent or 'RedditHistoricalBackfill/1.0'
-        self.base_url = "https://www.reddit.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.user_agent
-        })
-        self.rate_limit_delay = 2
+        posts = [extract_insert_tuple(post['data']) for post in data['data']['children'] if post['kind'] == 't3']
+        return posts, data['data'].get('after')
 
-    def fetch_top_posts(self, subreddit: str, time_filter: str = "all", limit: int = 100, after: str = None) -> List[Dict[str, Any]]:
+    def fetch_top_posts(self, subreddit: str, time_filter: str = "all", limit: int = 100, after: str = None) -> Tuple[List[Tuple], Optional[str]]:
         """
         Fetch top posts from a subreddit with time filtering.
 
@@ -47,9 +133,8 @@ class HistoricalBackfillClient:
             after: Pagination token
 
         Returns:
-            List of post dictionaries
+            Post rows in POST_COLUMNS order and the next pagination token
         """
-        url = f"{self.base_url}/r/{subreddit}/top.json"
         params = {
             't': time_filter,
             'limit': min(limit, 100),
@@ -60,32 +145,14 @@ class HistoricalBackfillClient:
             params['after'] = after
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
-            posts = []
-
-            if 'data' in data and 'children' in data['data']:
-                for post in data['data']['children']:
-                    if post['kind'] == 't3':
-                        post_data = self._extract_post_data(post['data'])
-                        posts.append(post_data)
-
-                # Return pagination info
-                after_token = data['data'].get('after')
-                return posts, after_token
-
-            time.sleep(self.rate_limit_delay)
-
+            return self._fetch_listing(_listing_url(self.base_url, subreddit, 'top'), params)
         except Exception as e:
             logging.error(f"Error fetching top posts from r/{subreddit}: {e}")
 
         return [], None
 
-    def fetch_hot_posts(self, subreddit: str, limit: int = 100, after: str = None) -> List[Dict[str, Any]]:
+    def fetch_hot_posts(self, subreddit: str, limit: int = 100, after: str = None) -> Tuple[List[Tuple], Optional[str]]:
         """Fetch hot posts from a subreddit."""
-        url = f"{self.base_url}/r/{subreddit}/hot.json"
         params = {
             'limit': min(limit, 100),
             'raw_json': 1
@@ -95,51 +162,33 @@ class HistoricalBackfillClient:
             params['after'] = after
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
-            posts = []
-
-            if 'data' in data and 'children' in data['data']:
-                for post in data['data']['children']:
-                    if post['kind'] == 't3':
-                        post_data = self._extract_post_data(post['data'])
-                        posts.append(post_data)
-
-                after_token = data['data'].get('after')
-                return posts, after_token
-
-            time.sleep(self.rate_limit_delay)
-
+            return self._fetch_listing(_listing_url(self.base_url, subreddit, 'hot'), params)
         except Exception as e:
             logging.error(f"Error fetching hot posts from r/{subreddit}: {e}")
 
         return [], None
 
-    def _extract_post_data(self, post: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract relevant data from a Reddit post."""
-        return {
-            'post_id': post.get('id', ''),
-            'title': post.get('title', ''),
-            'author': post.get('author', '[deleted]'),
-            'created_utc': int(post.get('created_utc', 0)),
-            'score': post.get('score', 0),
-            'num_comments': post.get('num_comments', 0),
-            'url': post.get('url', ''),
-            'selftext': post.get('selftext', ''),
-            'permalink': f"https://reddit.com{post.get('permalink', '')}" if post.get('permalink') else '',
-            'subreddit': post.get('subreddit', '')
-        }
-
 
 class HistoricalBackfill:
     """Main class for historical data backfill operations."""
 
-    def __init__(self):
+    def __init__(self, preload_existing_ids: bool = False):
+        """
+        Args:
+            preload_existing_ids: Scan all stored post IDs into a Bloom filter at startup.
+                Duplicates are rejected by the database (ON CONFLICT DO NOTHING) either
+                way; preloading only saves sending already-stored rows.
+        """
         self.database = None
         self.client = None
-        self.existing_post_ids: Set[str] = set()
+        self.log_listener: Optional[logging.handlers.QueueListener] = None
+        self.preload_existing_ids = preload_existing_ids
+        # Probabilistic set of stored post IDs (only when preloaded); hits are confirmed against the database
+        self.existing_post_ids: Optional[BloomFilter] = None
+        # Post IDs stored or confirmed during this run, to skip obvious duplicates without a round-trip
+        self.recent_post_ids = RecentIds(maxlen=8192)
+        # Guards the in-memory post ID structures shared by worker threads
+        self._ids_lock = threading.Lock()
 
     def initialize(self):
         """Initialize database and client connections."""
@@ -148,15 +197,21 @@ class HistoricalBackfill:
             load_environment()
             config = get_config_from_env()
 
-            # Setup logging
-            logging.basicConfig(
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                handlers=[
-                    logging.StreamHandler(),
-                    logging.FileHandler('logs/backfill.log')
-                ]
-            )
+            # Setup logging: terse progress on stdout, full records in the log file.
+            # Records are queued and written by a listener thread so worker threads
+            # never block on console or disk I/O
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(logging.Formatter('%(message)s'))
+            file_handler = logging.FileHandler('logs/backfill.log')
+            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+            log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+            root_logger = logging.getLogger()
+            root_logger.setLevel(logging.INFO)
+            root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            self.log_listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler)
+            self.log_listener.start()
 
             # Initialize database
             self.database = Database(
@@ -173,8 +228,9 @@ class HistoricalBackfill:
             # Initialize Reddit client
             self.client = HistoricalBackfillClient(config.user_agent)
 
-            # Load existing post IDs to avoid duplicates
-            self.load_existing_post_ids()
+            # Optionally load existing post IDs to skip known duplicates client-side
+            if self.preload_existing_ids:
+                self.load_existing_post_ids()
 
             logging.info("Historical backfill initialized successfully")
             return True
@@ -184,18 +240,30 @@ class HistoricalBackfill:
             return False
 
     def load_existing_post_ids(self):
-        """Load existing post IDs from database to avoid duplicates."""
+        """Load existing post IDs from database into the Bloom filter to avoid duplicates."""
         try:
-            query = "SELECT post_id FROM samsung_posts"
-            cursor = self.database.connection.cursor()
-            cursor.execute(query)
-
-            self.existing_post_ids = {row[0] for row in cursor.fetchall()}
+            existing_post_ids = BloomFilter(expected=500_000, fp_rate=0.01)
+            for post_id in self.database.iter_post_ids():
+                existing_post_ids.add(post_id)
+            self.existing_post_ids = existing_post_ids
             logging.info(f"Loaded {len(self.existing_post_ids)} existing post IDs")
 
         except Exception as e:
             logging.error(f"Error loading existing post IDs: {e}")
-            self.existing_post_ids = set()
+
+    def _is_known_post(self, post_id: str) -> bool:
+        """Check whether a post is already stored, confirming Bloom filter hits with a lookup."""
+        with self._ids_lock:
+            if post_id in self.recent_post_ids:
+                return True
+            maybe_known = self.existing_post_ids is not None and post_id in self.existing_post_ids
+
+        if maybe_known and self.database.post_exists(post_id):
+            with self._ids_lock:
+                self.recent_post_ids.add(post_id)
+            return True
+
+        return False
 
     def backfill_subreddit_comprehensive(self, subreddit: str, max_posts_per_method: int = 1000):
         """
@@ -206,128 +274,180 @@ class HistoricalBackfill:
             max_posts_per_method: Maximum posts to fetch per method
         """
         logging.info(f"🚀 Starting comprehensive backfill for r/{subreddit}")
-        print(f"🚀 Starting comprehensive backfill for r/{subreddit}")
-
-        total_new_posts = 0
-
-        # Method 1: Top posts of all time
-        logging.info("📈 Fetching top posts of all time...")
-        print("📈 Fetching top posts of all time...")
-        new_posts = self.fetch_with_pagination(
-            subreddit,
-            "top_all",
-            max_posts_per_method
-        )
-        total_new_posts += new_posts
-
-        # Method 2: Top posts by time periods
-        time_periods = ["year", "month", "week"]
-        for period in time_periods:
-            logging.info(f"📈 Fetching top posts from past {period}...")
-            print(f"📈 Fetching top posts from past {period}...")
-            new_posts = self.fetch_with_pagination(
-                subreddit,
-                f"top_{period}",
-                max_posts_per_method // 3
-            )
-            total_new_posts += new_posts
-
-        # Method 3: Hot posts (current trending)
-        logging.info("🔥 Fetching hot posts...")
-        print("🔥 Fetching hot posts...")
-        new_posts = self.fetch_with_pagination(
-            subreddit,
-            "hot",
-            max_posts_per_method // 2
-        )
-        total_new_posts += new_posts
+
+        # Newest stored post; hot pagination stops once it runs into already-covered history
+        watermark = self.database.get_latest_post_time_for_subreddit(subreddit)
+
+        # Top posts of all time, top posts by time period, then hot (current trending)
+        methods = [("top_all", max_posts_per_method, "📈 Fetching top posts of all time...")]
+        for period in ["year", "month", "week"]:
+            methods.append((f"top_{period}", max_posts_per_method // 3, f"📈 Fetching top posts from past {period}..."))
+        methods.append(("hot", max_posts_per_method // 2, "🔥 Fetching hot posts..."))
+
+        # Methods are HTTP-bound, so run them concurrently; the client's rate limiter
+        # and in-flight semaphore keep the combined request rate within Reddit's budget
+        with ThreadPoolExecutor(max_workers=len(methods)) as executor:
+            futures = []
+            for method, max_posts, message in methods:
+                logging.info(f"{message} (r/{subreddit})")
+                futures.append(executor.submit(self.fetch_with_pagination, subreddit, method, max_posts, watermark))
+
+            total_new_posts = sum(future.result() for future in futures)
 
         logging.info(f"✅ Backfill complete for r/{subreddit}! Added {total_new_posts} new posts")
-        print(f"✅ Backfill complete for r/{subreddit}! Added {total_new_posts} new posts")
 
         return total_new_posts
 
-    def fetch_with_pagination(self, subreddit: str, method: str, max_posts: int) -> int:
+    def backfill_subreddits(self, subreddits: List[str], max_posts_per_method: int = 1000) -> Dict[str, int]:
         """
-        Fetch posts with pagination support.
+        Run the comprehensive backfill for several subreddits concurrently.
+
+        Args:
+            subreddits: Subreddit names to backfill
+            max_posts_per_method: Maximum posts to fetch per method
+
+        Returns:
+            Mapping of subreddit name to number of new posts added
+        """
+        with ThreadPoolExecutor(max_workers=max(1, len(subreddits))) as executor:
+            futures = {
+                subreddit: executor.submit(self.backfill_subreddit_comprehensive, subreddit, max_posts_per_method)
+                for subreddit in subreddits
+            }
+            return {subreddit: future.result() for subreddit, future in futures.items()}
+
+    def paginate(self, subreddit: str, method: str, max_posts: int, watermark: int = 0) -> Iterator[List[Tuple]]:
+        """
+        Yield pages of posts for a fetch method, following Reddit's pagination tokens.
 
         Args:
             subreddit: Subreddit name
             method: Fetch method (top_all, top_year, etc., hot)
             max_posts: Maximum posts to fetch
+            watermark: created_utc of the newest stored post; hot pagination stops after
+                STALE_POST_LIMIT consecutive posts at or before it (0 disables the check)
 
-        Returns:
-            Number of new posts added
+        Yields:
+            Lists of post rows in POST_COLUMNS order, one per API page
         """
-        new_posts_count = 0
+        # Resolve the fetch method once, outside the pagination loop
+        if method.startswith("top_"):
+            fetcher = partial(self.client.fetch_top_posts, subreddit, time_filter=method.split("_", 1)[1])
+        elif method == "hot":
+            fetcher = partial(self.client.fetch_hot_posts, subreddit)
+        else:
+            logging.error(f"Unknown method: {method}")
+            return
+
+        # Top listings are ranked by score, so only hot can be cut off by post age
+        check_watermark = method == "hot" and watermark > 0
         after_token = None
         fetched_count = 0
+        stale_run = 0
 
         while fetched_count < max_posts:
-            # Determine fetch method
-            if method.startswith("top_"):
-                time_filter = method.split("_")[1]
-                posts, after_token = self.client.fetch_top_posts(
-                    subreddit,
-                    time_filter=time_filter,
-                    limit=min(100, max_posts - fetched_count),
-                    after=after_token
-                )
-            elif method == "hot":
-                posts, after_token = self.client.fetch_hot_posts(
-                    subreddit,
-                    limit=min(100, max_posts - fetched_count),
-                    after=after_token
-                )
-            else:
-                logging.error(f"Unknown method: {method}")
-                break
+            posts, after_token = fetcher(limit=min(100, max_posts - fetched_count), after=after_token)
 
             if not posts:
-                logging.info(f"No more posts available for {method}")
-                break
+                logging.info(f"No more posts available for r/{subreddit} {method}")
+                return
+
+            if check_watermark:
+                for index, row in enumerate(posts):
+                    stale_run = stale_run + 1 if row[_CREATED_UTC] <= watermark else 0
+                    if stale_run > STALE_POST_LIMIT:
+                        yield posts[:index + 1]
+                        logging.info(f"  🏁 r/{subreddit} {method}: Reached already stored posts, stopping")
+                        return
 
-            # Process posts
-            batch_new_posts = 0
-            for post_data in posts:
-                post_id = post_data.get('post_id', '')
+            fetched_count += len(posts)
+            yield posts
 
-                # Skip if we already have this post
-                if post_id in self.existing_post_ids:
-                    continue
+            # Check if we should continue
+            if not after_token:
+                logging.info(f"  🏁 r/{subreddit} {method}: No more posts available (after_token: {after_token})")
+                return
 
-                # Convert to RedditPost model and store
-                try:
-                    reddit_post = RedditPost.from_reddit_data(post_data)
+    def fetch_with_pagination(self, subreddit: str, method: str, max_posts: int, watermark: int = 0) -> int:
+        """
+        Fetch posts with pagination support.
 
-                    if self.database.insert_post(reddit_post.to_dict()):
-                        batch_new_posts += 1
-                        new_posts_count += 1
-                        self.existing_post_ids.add(post_id)
+        Pages are handed to a consumer thread through a bounded queue, so storing
+        one page overlaps with fetching the next.
 
-                        # Log every 10th post
-                        if new_posts_count % 10 == 0:
-                            post_time = datetime.fromtimestamp(reddit_post.created_utc).strftime('%Y-%m-%d %H:%M:%S')
-                            logging.info(f"  ✅ {new_posts_count} posts added | Latest: {post_time} | {reddit_post.title[:50]}...")
+        Args:
+            subreddit: Subreddit name
+            method: Fetch method (top_all, top_year, etc., hot)
+            max_posts: Maximum posts to fetch
+            watermark: created_utc of the newest stored post for the subreddit
 
+        Returns:
+            Number of new posts added
+        """
+        pages: "queue.Queue[Optional[List[Tuple]]]" = queue.Queue(maxsize=4)
+        totals = {'fetched': 0, 'new': 0}
+
+        def consume():
+            while True:
+                posts = pages.get()
+                if posts is None:
+                    return
+
+                try:
+                    batch_new_posts = self._store_page(posts, totals['new'])
                 except Exception as e:
-                    logging.error(f"Error processing post {post_id}: {e}")
+                    logging.error(f"Error storing page for r/{subreddit} {method}: {e}")
+                    batch_new_posts = 0
 
-            fetched_count += len(posts)
+                totals['fetched'] += len(posts)
+                totals['new'] += batch_new_posts
 
-            # Log progress
-            logging.info(f"  📊 {method}: Fetched {len(posts)} posts, {batch_new_posts} new, {fetched_count}/{max_posts} total")
-            print(f"  📊 {method}: Fetched {len(posts)} posts, {batch_new_posts} new, {fetched_count}/{max_posts} total")
+                # Log progress
+                logging.info(f"  📊 r/{subreddit} {method}: Fetched {len(posts)} posts, {batch_new_posts} new, {totals['fetched']}/{max_posts} total")
 
-            # Check if we should continue
-            if not after_token or len(posts) == 0:
-                logging.info(f"  🏁 {method}: No more posts available (after_token: {after_token})")
-                break
+        consumer = threading.Thread(target=consume, name=f"store-{subreddit}-{method}", daemon=True)
+        consumer.start()
+
+        try:
+            for posts in self.paginate(subreddit, method, max_posts, watermark):
+                pages.put(posts)
+        finally:
+            pages.put(None)
+            consumer.join()
+
+        return totals['new']
+
+    def _store_page(self, posts: List[Tuple], new_posts_count: int) -> int:
+        """
+        Store a page of posts with a single COPY.
+
+        Duplicates are filtered by the database via ON CONFLICT DO NOTHING; posts
+        already seen in this run are skipped without a round-trip.
+
+        Args:
+            posts: Post rows in POST_COLUMNS order from one API page
+            new_posts_count: New posts stored so far by this method (for progress logging)
+
+        Returns:
+            Number of new posts added from this page
+        """
+        # Skip posts we already have
+        rows = [row for row in posts if not self._is_known_post(row[_POST_ID])]
+
+        inserted_ids = self.database.copy_posts(rows)
+        with self._ids_lock:
+            for post_id in inserted_ids:
+                if self.existing_post_ids is not None:
+                    self.existing_post_ids.add(post_id)
+                self.recent_post_ids.add(post_id)
 
-            # Rate limiting
-            time.sleep(self.client.rate_limit_delay)
+        batch_new_posts = len(inserted_ids)
+        if batch_new_posts and logging.getLogger().isEnabledFor(logging.INFO):
+            latest_row = rows[-1]
+            post_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(latest_row[_CREATED_UTC]))
+            logging.info(f"  ✅ {new_posts_count + batch_new_posts} posts added | Latest: {post_time} | {latest_row[_TITLE][:50]}...")
 
-        return new_posts_count
+        return batch_new_posts
 
     def get_current_stats(self, subreddit: str = None):
         """Get current database statistics."""
@@ -343,8 +463,7 @@ class HistoricalBackfill:
                 WHERE subreddit = %s
                 GROUP BY subreddit
                 """
-                cursor = self.database.connection.cursor()
-                cursor.execute(query, (subreddit,))
+                params = (subreddit,)
             else:
                 query = """
                 SELECT
@@ -356,16 +475,20 @@ class HistoricalBackfill:
                 GROUP BY subreddit
                 ORDER BY subreddit
                 """
-                cursor = self.database.connection.cursor()
-                cursor.execute(query)
+                params = None
 
-            results = cursor.fetchall()
+            results = []
 
             print("\n📊 Current Database Stats:")
             print("-" * 80)
-            for row in results:
-                subreddit_name, earliest, latest, count = row
-                print(f"r/{subreddit_name:12} | {count:6} posts | {earliest} → {latest}")
+            # Stream rows from a server-side cursor rather than materializing them with fetchall()
+            with self.database.cursor(name='subreddit_stats') as cursor:
+                cursor.itersize = 1000
+                cursor.execute(query, params)
+                for row in cursor:
+                    subreddit_name, earliest, latest, count = row
+                    print(f"r/{subreddit_name:12} | {count:6} posts | {earliest} → {latest}")
+                    results.append(row)
             print("-" * 80)
 
             return results
@@ -376,9 +499,15 @@ class HistoricalBackfill:
 
     def shutdown(self):
         """Clean up connections."""
+        if self.client:
+            self.client.close()
         if self.database:
             self.database.disconnect()
         logging.info("Backfill shutdown complete")
+        if self.log_listener:
+            # Flush queued records before exiting
+            self.log_listener.stop()
+            self.log_listener = None
 
 
 def main():
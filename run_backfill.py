@@ -44,22 +44,17 @@ def main():
             print("❌ Backfill cancelled")
             return
 
-        total_new_posts = 0
         overall_start = datetime.now()
 
-        # Backfill each subreddit
-        for i, subreddit in enumerate(subreddits_to_backfill, 1):
-            print(f"\n🔄 [{i}/{len(subreddits_to_backfill)}] Processing r/{subreddit}")
-            print("-" * 40)
+        # Backfill all subreddits concurrently
+        print(f"\n🔄 Processing {len(subreddits_to_backfill)} subreddits concurrently")
+        print("-" * 40)
 
-            start_time = datetime.now()
-            new_posts = backfill.backfill_subreddit_comprehensive(subreddit, max_posts_per_method=800)
-            end_time = datetime.now()
+        results = backfill.backfill_subreddits(subreddits_to_backfill, max_posts_per_method=800)
+        total_new_posts = sum(results.values())
 
-            duration = (end_time - start_time).total_seconds()
-            total_new_posts += new_posts
-
-            print(f"✅ r/{subreddit} complete: {new_posts} new posts in {duration:.1f}s")
+        for subreddit, new_posts in results.items():
+            print(f"✅ r/{subreddit} complete: {new_posts} new posts")
 
         overall_end = datetime.now()
         overall_duration = (overall_end - overall_start).total_seconds()
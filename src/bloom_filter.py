@@ -0,0 +1,45 @@
+"""Bloom filter for compact probabilistic membership checks on post IDs."""
+
+import hashlib
+import math
+from typing import List
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using Kirsch-Mitzenmacher double hashing."""
+
+    def __init__(self, expected: int = 500_000, fp_rate: float = 0.01):
+        """
+        Initialize an empty Bloom filter.
+
+        Args:
+            expected: Number of items the filter is sized for
+            fp_rate: Target false positive rate at the expected size
+        """
+        self.size = max(8, math.ceil(-expected * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, math.ceil(-math.log2(fp_rate)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        """Derive the bit positions for an item from a single 128-bit digest."""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Return True if the item may be present, False if it is definitely absent."""
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self._count
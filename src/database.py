@@ -1,14 +1,350 @@
 """Database connection and management module."""
 
+import csv
+import io
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import Optional, Dict, Any, List
+import psycopg2.errors
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from typing import Optional, Dict, Any, Callable, Iterator, List, Sequence, Set, Tuple
 import os
 
 
 logger = logging.getLogger(__name__)
 
+# Column order expected by insert_posts_batch rows
+POST_COLUMNS = ('post_id', 'title', 'author', 'created_utc', 'score', 'num_comments',
+                'url', 'selftext', 'permalink', 'subreddit')
+
+# Column order expected by insert_tweets_batch rows
+TWEET_COLUMNS = ('tweet_id', 'text', 'author_id', 'author_username', 'author_name', 'author_verified',
+                 'created_at', 'created_utc', 'lang', 'retweet_count', 'like_count', 'reply_count',
+                 'quote_count', 'conversation_id', 'in_reply_to_user_id', 'hashtags', 'referenced_tweets')
+
+# DDL run by initialize_schema(); every statement is idempotent
+POSTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samsung_posts (
+    post_id BIGINT PRIMARY KEY,
+    title TEXT NOT NULL,
+    author VARCHAR(100),
+    created_utc BIGINT NOT NULL,
+    score INTEGER DEFAULT 0,
+    num_comments INTEGER DEFAULT 0,
+    url TEXT,
+    selftext TEXT,
+    permalink TEXT,
+    subreddit VARCHAR(50) NOT NULL,
+    retrieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) WITH (fillfactor = 90);
+
+-- The primary key already indexes post_id; older tables also carry a duplicate UNIQUE index.
+-- Checked first so startup does not take an ACCESS EXCLUSIVE lock once it is gone.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_constraint
+               WHERE conrelid = 'samsung_posts'::regclass AND conname = 'samsung_posts_post_id_key') THEN
+        ALTER TABLE samsung_posts DROP CONSTRAINT samsung_posts_post_id_key;
+    END IF;
+END $$;
+
+-- Migrate post_id from the old base36 VARCHAR column to its integer value
+-- Raises on anything that is not a base36 number rather than storing a wrong ID
+CREATE OR REPLACE FUNCTION pg_temp.base36_to_bigint(value TEXT) RETURNS BIGINT AS $$
+DECLARE
+    result NUMERIC := 0;
+BEGIN
+    IF value !~ '^[0-9A-Za-z]+$' THEN
+        RAISE EXCEPTION 'invalid base36 post_id: %', value;
+    END IF;
+    FOR pos IN 1..length(value) LOOP
+        result := result * 36 + strpos('0123456789abcdefghijklmnopqrstuvwxyz', lower(substr(value, pos, 1))) - 1;
+    END LOOP;
+    RETURN result::BIGINT;
+END
+$$ LANGUAGE plpgsql IMMUTABLE STRICT;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'samsung_posts' AND column_name = 'post_id' AND data_type = 'character varying') THEN
+        ALTER TABLE samsung_posts ALTER COLUMN post_id TYPE BIGINT USING pg_temp.base36_to_bigint(post_id);
+    END IF;
+END $$;
+
+-- Leave page headroom so later score/comment updates can stay HOT (in-page).
+-- Only altered if unset, since ALTER TABLE ... SET locks the table even when nothing changes.
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_class
+                   WHERE oid = 'samsung_posts'::regclass AND 'fillfactor=90' = ANY(reloptions)) THEN
+        ALTER TABLE samsung_posts SET (fillfactor = 90);
+    END IF;
+END $$;
+
+-- Nothing queries by retrieved_at; skip the per-insert index maintenance
+DROP INDEX IF EXISTS idx_retrieved_at;
+
+CREATE INDEX IF NOT EXISTS idx_created_utc ON samsung_posts(created_utc);
+-- Serves the per-subreddit MAX(created_utc) lookups run every poll cycle
+CREATE INDEX IF NOT EXISTS idx_subreddit_created ON samsung_posts(subreddit, created_utc DESC);
+"""
+
+TWEETS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS twitter_tweets (
+    tweet_id BIGINT PRIMARY KEY,
+    text TEXT NOT NULL,
+    author_id VARCHAR(20) NOT NULL,
+    author_username VARCHAR(50),
+    author_name VARCHAR(100),
+    author_verified BOOLEAN DEFAULT FALSE,
+    created_at VARCHAR(30),
+    created_utc BIGINT NOT NULL,
+    lang VARCHAR(10) DEFAULT 'und',
+    retweet_count INTEGER DEFAULT 0,
+    like_count INTEGER DEFAULT 0,
+    reply_count INTEGER DEFAULT 0,
+    quote_count INTEGER DEFAULT 0,
+    conversation_id VARCHAR(20),
+    in_reply_to_user_id VARCHAR(20),
+    hashtags TEXT[] DEFAULT '{}',
+    referenced_tweets TEXT,
+    retrieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) WITH (fillfactor = 90);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_class
+                   WHERE oid = 'twitter_tweets'::regclass AND 'fillfactor=90' = ANY(reloptions)) THEN
+        ALTER TABLE twitter_tweets SET (fillfactor = 90);
+    END IF;
+END $$;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_constraint
+               WHERE conrelid = 'twitter_tweets'::regclass AND conname = 'twitter_tweets_tweet_id_key') THEN
+        ALTER TABLE twitter_tweets DROP CONSTRAINT twitter_tweets_tweet_id_key;
+    END IF;
+END $$;
+
+-- Migrate tweet_id from the old VARCHAR column
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'twitter_tweets' AND column_name = 'tweet_id' AND data_type = 'character varying') THEN
+        ALTER TABLE twitter_tweets ALTER COLUMN tweet_id TYPE BIGINT USING tweet_id::BIGINT;
+    END IF;
+END $$;
+
+DROP INDEX IF EXISTS idx_twitter_retrieved_at;
+
+-- Migrate hashtags from the old comma-separated TEXT column
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'twitter_tweets' AND column_name = 'hashtags' AND data_type = 'text') THEN
+        DROP INDEX IF EXISTS idx_twitter_hashtags;
+        ALTER TABLE twitter_tweets
+            ALTER COLUMN hashtags TYPE TEXT[] USING COALESCE(string_to_array(NULLIF(hashtags, ''), ','), '{}'),
+            ALTER COLUMN hashtags SET DEFAULT '{}';
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_twitter_created_utc ON twitter_tweets(created_utc);
+CREATE INDEX IF NOT EXISTS idx_twitter_hashtags ON twitter_tweets USING GIN (hashtags);
+CREATE INDEX IF NOT EXISTS idx_twitter_author_username ON twitter_tweets(author_username);
+CREATE INDEX IF NOT EXISTS idx_twitter_author_created ON twitter_tweets(author_username, created_utc DESC);
+"""
+
+SCHEMAS = {'posts': POSTS_SCHEMA, 'tweets': TWEETS_SCHEMA}
+
+# Array type of each POST_COLUMNS entry when a batch is passed column-wise to unnest()
+POST_ARRAY_TYPES = ('BIGINT[]', 'TEXT[]', 'TEXT[]', 'BIGINT[]', 'INTEGER[]', 'INTEGER[]',
+                    'TEXT[]', 'TEXT[]', 'TEXT[]', 'TEXT[]')
+
+# Typed placeholders so all-NULL or empty columns still bind as the right array type
+POST_ARRAY_PLACEHOLDERS = ', '.join(f'%s::{array_type}' for array_type in POST_ARRAY_TYPES)
+
+# Batch post insert whose SQL text does not depend on the batch size
+INSERT_POSTS_UNNEST = f"""
+INSERT INTO samsung_posts ({', '.join(POST_COLUMNS)})
+SELECT * FROM unnest({POST_ARRAY_PLACEHOLDERS})
+ON CONFLICT (post_id) DO NOTHING
+RETURNING post_id
+"""
+
+# Inserts prepared per connection on first use, so the server skips parse/plan on later calls.
+# Each is prepared on its own: a database may only have one of the two tables.
+PREPARED_STATEMENTS = {
+    'insert_posts_stmt': f"""
+    PREPARE insert_posts_stmt ({', '.join(POST_ARRAY_TYPES)}) AS
+        INSERT INTO samsung_posts ({', '.join(POST_COLUMNS)})
+        SELECT * FROM unnest({', '.join(f'${position}' for position in range(1, len(POST_COLUMNS) + 1))})
+        ON CONFLICT (post_id) DO NOTHING
+        RETURNING post_id
+    """,
+    'insert_tweet_stmt': f"""
+    PREPARE insert_tweet_stmt (BIGINT, TEXT, VARCHAR, VARCHAR, VARCHAR, BOOLEAN, VARCHAR, BIGINT, VARCHAR,
+                               INTEGER, INTEGER, INTEGER, INTEGER, VARCHAR, VARCHAR, TEXT[], TEXT) AS
+        INSERT INTO twitter_tweets ({', '.join(TWEET_COLUMNS)})
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17)
+        ON CONFLICT (tweet_id) DO NOTHING
+        RETURNING tweet_id
+    """,
+}
+
+# pgbouncer's default port; its transaction pooling does not keep prepared statements
+PGBOUNCER_PORT = 6432
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """Pool connection that tracks when it was last used and which statements it has prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: Set[str] = set()
+        self.last_used = time.monotonic()
+
+    def prepare(self, cursor: psycopg2.extensions.cursor, statement: str) -> None:
+        """
+        Prepare one statement from PREPARED_STATEMENTS on this session, if not done already.
+
+        Must run inside a savepoint: any error other than the statement already
+        existing is raised with the transaction aborted.
+        """
+        if statement in self.prepared:
+            return
+        try:
+            cursor.execute(PREPARED_STATEMENTS[statement])
+        except psycopg2.errors.DuplicatePreparedStatement:
+            # Server session reused behind a pooler and already prepared; clear the error
+            cursor.execute("ROLLBACK TO SAVEPOINT prepared_insert")
+            cursor.execute("SAVEPOINT prepared_insert")
+        self.prepared.add(statement)
+
+
+class _ReconnectingCursor:
+    """
+    Cursor wrapper that retries a failed first statement once on a fresh connection.
+
+    A connection dropped by the server or pgbouncer while it sat in the pool
+    only fails when the first statement is sent. Nothing has run on it yet,
+    so the connection can be replaced and the statement sent again.
+    """
+
+    def __init__(self, database: 'Database', connection: PooledConnection, cursor_kwargs: Dict[str, Any]):
+        self._database = database
+        self._connection: Optional[PooledConnection] = connection
+        self._cursor_kwargs = cursor_kwargs
+        # Public attributes set by the caller (e.g. itersize), reapplied to a replacement cursor
+        self._cursor_settings: Dict[str, Any] = {}
+        self._cursor = connection.cursor(**cursor_kwargs)
+        self._executed = False
+
+    def execute(self, query: Any, params: Any = None) -> None:
+        if self._executed:
+            self._cursor.execute(query, params)
+            return
+        try:
+            self._cursor.execute(query, params)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            if not self._connection.closed:
+                raise
+            logger.info("Database connection lost, retrying on a new one: %s", e)
+            self._database.pool.putconn(self._connection, close=True)
+            self._connection = None
+            self._connection = self._database._checkout()
+            self._cursor = self._connection.cursor(**self._cursor_kwargs)
+            for name, value in self._cursor_settings.items():
+                setattr(self._cursor, name, value)
+            self._cursor.execute(query, params)
+        self._executed = True
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith('_'):
+            super().__setattr__(name, value)
+            return
+        setattr(self._cursor, name, value)
+        self._cursor_settings[name] = value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._cursor)
+
+
+@lru_cache(maxsize=None)
+def _db_defaults() -> Dict[str, Any]:
+    """
+    Resolve connection defaults from the environment once per process.
+
+    Resolved on first use rather than at import so that a .env file loaded by
+    the entry point after importing this module is still picked up.
+    """
+    prepared_setting = os.getenv('DB_PREPARED_STATEMENTS', 'auto').lower()
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'user': os.getenv('DB_USER', 'adgear'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'database': os.getenv('DB_NAME', 'metadataservice'),
+        'port': int(os.getenv('DB_PORT', '6432')),
+        'min_connections': int(os.getenv('DB_POOL_MIN', '2')),
+        'max_connections': int(os.getenv('DB_POOL_MAX', '8')),
+        'idle_ping_seconds': float(os.getenv('DB_POOL_IDLE_PING', '30')),
+        # None means decide from the port (auto)
+        'prepared_statements': None if prepared_setting == 'auto' else prepared_setting in ('1', 'true', 'yes'),
+        'synchronous_commit': os.getenv('DB_SYNCHRONOUS_COMMIT', 'off').lower(),
+    }
+
+
+_BASE36_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def decode_post_id(post_id: str) -> int:
+    """Convert a base36 Reddit post ID to the integer stored in samsung_posts."""
+    value = int(post_id, 36)
+    # int() also accepts underscores and surrounding whitespace, e.g. the fullname 't3_abc'
+    if not (post_id.isascii() and post_id.isalnum()):
+        raise ValueError(f"invalid base36 post ID: {post_id!r}")
+    return value
+
+
+def encode_post_id(value: int) -> str:
+    """Convert a stored integer post ID back to Reddit's base36 form."""
+    digits = []
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(_BASE36_DIGITS[remainder])
+        if not value:
+            return ''.join(reversed(digits))
+
+
+def _with_integer_ids(rows: Sequence[Tuple], decode: Callable[[str], int], kind: str) -> List[Tuple]:
+    """Replace the leading string ID of each row with its stored integer form, skipping malformed IDs."""
+    db_rows = []
+    for row in rows:
+        try:
+            db_rows.append((decode(row[0]),) + tuple(row[1:]))
+        except (TypeError, ValueError):
+            logger.warning("Skipping %s with invalid ID %r", kind, row[0])
+    return db_rows
+
+
+def post_row(post_data: Dict[str, Any]) -> Tuple:
+    """Convert a post dict (as from RedditPost.to_dict()) to a row in POST_COLUMNS order."""
+    return tuple(post_data[column] for column in POST_COLUMNS)
+
+
+def tweet_row(tweet_data: Dict[str, Any]) -> Tuple:
+    """Convert a tweet dict (as from ProcessedTweet.to_dict()) to a row in TWEET_COLUMNS order."""
+    return tuple(tweet_data[column] for column in TWEET_COLUMNS)
+
 
 class Database:
     """PostgreSQL database connection manager."""
@@ -18,141 +354,402 @@ class Database:
                  user: str = None,
                  password: str = None,
                  database: str = None,
-                 port: int = None):
-        """Initialize database connection parameters."""
-        self.host = host or os.getenv('DB_HOST', 'localhost')
-        self.user = user or os.getenv('DB_USER', 'adgear')
-        self.password = password or os.getenv('DB_PASSWORD', '')
-        self.database = database or os.getenv('DB_NAME', 'metadataservice')
-        self.port = port or int(os.getenv('DB_PORT', '6432'))
-        self.connection: Optional[psycopg2.extensions.connection] = None
+                 port: int = None,
+                 min_connections: int = None,
+                 max_connections: int = None,
+                 idle_ping_seconds: Optional[float] = None,
+                 prepared_statements: Optional[bool] = None,
+                 synchronous_commit: str = None):
+        """
+        Initialize database connection parameters.
+
+        Args:
+            min_connections: Connections opened up front (default DB_POOL_MIN or 2)
+            max_connections: Upper bound on pooled connections (default DB_POOL_MAX or 8)
+            idle_ping_seconds: Ping pooled connections idle for longer than this before reuse
+                (default DB_POOL_IDLE_PING or 30); 0 pings on every checkout
+            prepared_statements: Prepare single-row inserts per connection. Defaults to
+                DB_PREPARED_STATEMENTS, or off when connecting through pgbouncer's port
+            synchronous_commit: synchronous_commit for insert transactions (default DB_SYNCHRONOUS_COMMIT
+                or off). With off, a commit returns before its WAL is flushed, so a server
+                crash can lose the last few hundred milliseconds of inserts; posts and
+                tweets are simply fetched again on the next cycle
+        """
+        defaults = _db_defaults()
+        self.host = host or defaults['host']
+        self.user = user or defaults['user']
+        self.password = password or defaults['password']
+        self.database = database or defaults['database']
+        self.port = port or defaults['port']
+        self.min_connections = min_connections or defaults['min_connections']
+        self.max_connections = max(max_connections or defaults['max_connections'], self.min_connections)
+        if idle_ping_seconds is None:
+            idle_ping_seconds = defaults['idle_ping_seconds']
+        self.idle_ping_seconds = idle_ping_seconds
+        if prepared_statements is None:
+            prepared_statements = defaults['prepared_statements']
+        if prepared_statements is None:
+            prepared_statements = self.port != PGBOUNCER_PORT
+        self.prepared_statements = prepared_statements
+        self.synchronous_commit = synchronous_commit or defaults['synchronous_commit']
+        self.pool: Optional[ThreadedConnectionPool] = None
+        # ThreadedConnectionPool raises when exhausted; this makes callers wait instead
+        self._pool_slots = threading.BoundedSemaphore(self.max_connections)
+        # Connection pinned to the current thread by transaction()
+        self._local = threading.local()
 
     def connect(self) -> bool:
-        """Establish database connection."""
+        """Create the connection pool and verify the database is reachable."""
         try:
-            self.connection = psycopg2.connect(
+            self.pool = ThreadedConnectionPool(
+                self.min_connections,
+                self.max_connections,
                 host=self.host,
                 user=self.user,
                 password=self.password,
                 database=self.database,
                 port=self.port,
-                cursor_factory=RealDictCursor
+                connection_factory=PooledConnection
             )
-            logger.info(f"Connected to database {self.database} at {self.host}:{self.port}")
+            with self.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            logger.info("Connected to database %s at %s:%s (pool size %s-%s)", self.database, self.host, self.port,
+                        self.min_connections, self.max_connections)
             return True
         except psycopg2.Error as e:
             logger.error(f"Failed to connect to database: {e}")
             return False
 
     def disconnect(self):
-        """Close database connection."""
-        if self.connection:
-            self.connection.close()
+        """Close all pooled database connections."""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
             logger.info("Database connection closed")
 
-    def create_tables(self):
-        """Create the samsung_posts table if it doesn't exist."""
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS samsung_posts (
-            post_id VARCHAR(20) PRIMARY KEY,
-            title TEXT NOT NULL,
-            author VARCHAR(100),
-            created_utc BIGINT NOT NULL,
-            score INTEGER DEFAULT 0,
-            num_comments INTEGER DEFAULT 0,
-            url TEXT,
-            selftext TEXT,
-            permalink TEXT,
-            subreddit VARCHAR(50) NOT NULL,
-            retrieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(post_id)
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_created_utc ON samsung_posts(created_utc);
-        CREATE INDEX IF NOT EXISTS idx_retrieved_at ON samsung_posts(retrieved_at);
+    @contextmanager
+    def cursor(self, **kwargs) -> Iterator[psycopg2.extensions.cursor]:
+        """
+        Borrow a pooled connection and yield a cursor on it.
+
+        The transaction is committed when the block exits normally and rolled
+        back if it raises; the connection is then returned to the pool. If the
+        connection turns out to be dead when the first statement is sent, that
+        statement is retried once on a fresh connection. Inside transaction()
+        the pinned connection is used and nothing is committed here.
+
+        Args:
+            **kwargs: Passed to connection.cursor() (e.g. name for a server-side cursor)
+        """
+        pinned = getattr(self._local, 'connection', None)
+        if pinned is not None:
+            with pinned.cursor(**kwargs) as cursor:
+                yield cursor
+            return
+
+        with self._pool_slots:
+            cursor = _ReconnectingCursor(self, self._checkout(), kwargs)
+            try:
+                yield cursor
+                cursor.close()
+                cursor._connection.commit()
+            except BaseException:
+                connection = cursor._connection
+                if connection is not None and not connection.closed:
+                    connection.rollback()
+                raise
+            finally:
+                if cursor._connection is not None:
+                    cursor.close()
+                    self._checkin(cursor._connection)
+
+    @contextmanager
+    def _write_cursor(self) -> Iterator[psycopg2.extensions.cursor]:
+        """Yield a cursor() whose transaction commits with the configured synchronous_commit."""
+        with self.cursor() as cursor:
+            # SET LOCAL ends with the transaction, so it also works through pgbouncer's transaction pooling
+            cursor.execute("SET LOCAL synchronous_commit TO %s", (self.synchronous_commit,))
+            yield cursor
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group several Database calls on this thread into a single transaction.
+
+        All calls made inside the block share one pooled connection and are
+        committed once when it exits, or rolled back if it raises. If any
+        statement fails, the whole transaction is rolled back. Nested blocks
+        join the outer transaction.
+        """
+        if getattr(self._local, 'connection', None) is not None:
+            yield
+            return
+
+        with self._pool_slots:
+            connection = self._checkout()
+            self._local.connection = connection
+            try:
+                yield
+                if connection.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+                    logger.warning("Transaction had a failed statement, rolling back")
+                    connection.rollback()
+                else:
+                    connection.commit()
+            except BaseException:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+            finally:
+                self._local.connection = None
+                self._checkin(connection)
+
+    def _checkout(self) -> PooledConnection:
+        """Take a live connection from the pool, replacing any the server has dropped."""
+        for _ in range(self.max_connections + 1):
+            connection = self.pool.getconn()
+            if self._is_live(connection):
+                return connection
+            logger.info("Discarding dead pooled database connection")
+            self.pool.putconn(connection, close=True)
+        raise psycopg2.OperationalError("No live database connection available")
+
+    def _is_live(self, connection: PooledConnection) -> bool:
+        """Check a pooled connection, pinging it only if it has sat idle (e.g. may have been reaped by pgbouncer)."""
+        if connection.closed:
+            return False
+        if time.monotonic() - connection.last_used < self.idle_ping_seconds:
+            return True
+        try:
+            # One extra round-trip; it also opens the caller's transaction, which is harmless
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checkin(self, connection: PooledConnection) -> None:
+        """Return a connection to the pool; closed ones are dropped by the pool."""
+        connection.last_used = time.monotonic()
+        self.pool.putconn(connection)
+
+    def initialize_schema(self, tables: Sequence[str] = ('posts', 'tweets')) -> bool:
         """
+        Create tables and indexes in a single round-trip and commit.
+
+        Args:
+            tables: Which schemas to create, any of 'posts' and 'tweets'
+
+        Returns:
+            True if the DDL ran successfully, False otherwise
+        """
+        ddl = '\n'.join(SCHEMAS[table] for table in tables)
 
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(create_table_query)
-                self.connection.commit()
-                logger.info("Tables created successfully")
+            with self.cursor() as cursor:
+                cursor.execute(ddl)
+                logger.info("Schema initialized for: %s", ', '.join(tables))
                 return True
         except psycopg2.Error as e:
-            logger.error(f"Failed to create tables: {e}")
-            self.connection.rollback()
+            logger.error("Failed to initialize schema for %s: %s", ', '.join(tables), e)
             return False
 
+    def create_tables(self):
+        """Create the samsung_posts table if it doesn't exist."""
+        return self.initialize_schema(('posts',))
+
+    def _execute_prepared(self, statement: str, params: Sequence[Any],
+                          placeholders: Optional[str] = None) -> Optional[List[Tuple]]:
+        """
+        Run a prepared insert and fetch its RETURNING rows.
+
+        The statement is prepared on first use and run inside a savepoint, so
+        a failure leaves the caller's transaction usable for the plain-SQL fallback.
+
+        Args:
+            statement: Name of a statement from PREPARED_STATEMENTS
+            params: Parameter values in the statement's order
+            placeholders: Parameter list for EXECUTE (defaults to one plain %s per value)
+
+        Returns:
+            Returned rows, or None if the prepared path is unavailable or failed
+            and the caller should fall back to plain SQL
+        """
+        if not self.prepared_statements:
+            return None
+
+        placeholders = placeholders or ', '.join(['%s'] * len(params))
+        try:
+            with self._write_cursor() as cursor:
+                cursor.execute("SAVEPOINT prepared_insert")
+                try:
+                    cursor.connection.prepare(cursor, statement)
+                    cursor.execute(f"EXECUTE {statement} ({placeholders})", params)
+                    rows = cursor.fetchall()
+                except psycopg2.errors.InvalidSqlStatementName:
+                    # A transaction-pooling proxy handed us a server session without our statements
+                    cursor.execute("ROLLBACK TO SAVEPOINT prepared_insert")
+                    logger.warning("Prepared statements unavailable on this connection, using plain inserts")
+                    self.prepared_statements = False
+                    return None
+                except psycopg2.Error as e:
+                    # e.g. the table for this statement does not exist; the fallback reports real errors
+                    cursor.execute("ROLLBACK TO SAVEPOINT prepared_insert")
+                    logger.debug("Prepared %s failed, falling back to plain SQL: %s", statement, e)
+                    return None
+                cursor.execute("RELEASE SAVEPOINT prepared_insert")
+                return rows
+        except psycopg2.Error as e:
+            logger.error("❌ Database error executing %s: %s", statement, e)
+            return None
+
     def insert_post(self, post_data: Dict[str, Any]) -> bool:
-        """Insert a new post into the database."""
-        insert_query = """
-        INSERT INTO samsung_posts
-        (post_id, title, author, created_utc, score, num_comments, url, selftext, permalink, subreddit)
-        VALUES (%(post_id)s, %(title)s, %(author)s, %(created_utc)s, %(score)s, %(num_comments)s,
-                %(url)s, %(selftext)s, %(permalink)s, %(subreddit)s)
-        ON CONFLICT (post_id) DO NOTHING
+        """Insert a new post into the database; returns False if it already exists."""
+        return bool(self.insert_posts_batch([post_row(post_data)]))
+
+    def insert_posts_batch(self, rows: Sequence[Tuple]) -> List[str]:
+        """
+        Insert many posts in a single statement.
+
+        Rows are passed column-wise as arrays and expanded with unnest(), so the
+        statement text is the same for every batch and can be prepared once.
+
+        Args:
+            rows: Post tuples with values in POST_COLUMNS order
+
+        Returns:
+            IDs of the posts that were newly inserted
+        """
+        rows = _with_integer_ids(rows, decode_post_id, 'post')
+        if not rows:
+            return []
+
+        columns = [list(column) for column in zip(*rows)]
+
+        inserted = self._execute_prepared('insert_posts_stmt', columns, POST_ARRAY_PLACEHOLDERS)
+        if inserted is None:
+            try:
+                with self._write_cursor() as cursor:
+                    cursor.execute(INSERT_POSTS_UNNEST, columns)
+                    inserted = cursor.fetchall()
+            except psycopg2.Error as e:
+                logger.error("❌ Database error batch inserting %s posts: %s", len(rows), e)
+                return []
+
+        logger.debug("Batch inserted %s of %s posts", len(inserted), len(rows))
+        return [encode_post_id(row[0]) for row in inserted]
+
+    def copy_posts(self, rows: Sequence[Tuple]) -> List[str]:
+        """
+        Bulk load posts with COPY into a staging table, then merge into samsung_posts.
+
+        Faster than insert_posts_batch for large batches since rows are streamed
+        rather than parsed as one big VALUES list.
+
+        Args:
+            rows: Post tuples with values in POST_COLUMNS order
+
+        Returns:
+            IDs of the posts that were newly inserted
         """
+        rows = _with_integer_ids(rows, decode_post_id, 'post')
+        if not rows:
+            return []
 
-        # Enhanced debug logging
-        from datetime import datetime
-        post_time_readable = datetime.fromtimestamp(post_data['created_utc']).strftime('%Y-%m-%d %H:%M:%S UTC')
-        logger.info(f"🔍 DEBUG: Attempting to insert post {post_data['post_id']}")
-        logger.debug(f"🔍 DEBUG: Post details - created_utc: {post_data['created_utc']} ({post_time_readable}), "
-                    f"title: '{post_data['title'][:100]}...', author: {post_data['author']}")
+        columns = ', '.join(POST_COLUMNS)
+        # Non-numeric values are quoted so empty strings stay distinct from NULL
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n').writerows(rows)
+        buffer.seek(0)
 
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(insert_query, post_data)
-                self.connection.commit()
-                if cursor.rowcount > 0:
-                    logger.info(f"✅ DEBUG: Successfully inserted new post: {post_data['post_id']}")
-                    return True
-                else:
-                    logger.info(f"⚠️ DEBUG: Post already exists in database: {post_data['post_id']}")
-                    return False
+            with self._write_cursor() as cursor:
+                cursor.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS samsung_posts_staging
+                (LIKE samsung_posts INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+                """)
+                cursor.copy_expert(f"COPY samsung_posts_staging ({columns}) FROM STDIN WITH (FORMAT CSV)", buffer)
+                cursor.execute(f"""
+                INSERT INTO samsung_posts ({columns})
+                SELECT {columns} FROM samsung_posts_staging
+                ON CONFLICT (post_id) DO NOTHING
+                RETURNING post_id
+                """)
+                inserted = cursor.fetchall()
+                logger.debug("Copied %s of %s posts", len(inserted), len(rows))
+                return [encode_post_id(row[0]) for row in inserted]
         except psycopg2.Error as e:
-            logger.error(f"❌ Database error inserting post {post_data.get('post_id', 'unknown')}: {e}")
-            self.connection.rollback()
+            logger.error("❌ Database error copying %s posts: %s", len(rows), e)
+            return []
+
+    def post_exists(self, post_id: str) -> bool:
+        """Check whether a post is already stored."""
+        query = "SELECT 1 FROM samsung_posts WHERE post_id = %s"
+
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(query, (decode_post_id(post_id),))
+                return cursor.fetchone() is not None
+        except ValueError:
             return False
+        except psycopg2.Error as e:
+            logger.error("Failed to check post %s: %s", post_id, e)
+            return False
+
+    def iter_post_ids(self) -> Iterator[str]:
+        """Fetch all stored post IDs in one COPY stream, skipping per-row result handling."""
+        buffer = io.StringIO()
+
+        try:
+            with self.cursor() as cursor:
+                cursor.copy_expert("COPY (SELECT post_id FROM samsung_posts) TO STDOUT", buffer)
+        except psycopg2.Error as e:
+            logger.error("Failed to stream post IDs: %s", e)
+            return iter(())
+
+        return map(encode_post_id, map(int, buffer.getvalue().splitlines()))
 
     def get_latest_post_time(self) -> Optional[int]:
         """Get the created_utc timestamp of the most recent post."""
         query = "SELECT MAX(created_utc) as latest_time FROM samsung_posts"
 
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(query)
                 result = cursor.fetchone()
-                latest_time = result['latest_time'] if result and result['latest_time'] else 0
-
-                # Enhanced debug logging
-                from datetime import datetime
-                if latest_time > 0:
-                    latest_readable = datetime.fromtimestamp(latest_time).strftime('%Y-%m-%d %H:%M:%S UTC')
-                    logger.info(f"🔍 DEBUG: Latest post in database: {latest_time} ({latest_readable})")
-                else:
-                    logger.info(f"🔍 DEBUG: No posts found in database, using timestamp 0")
-
+                latest_time = result[0] if result and result[0] else 0
+                logger.debug("Latest post in database: %s", latest_time)
                 return latest_time
         except psycopg2.Error as e:
             logger.error(f"❌ Failed to get latest post time: {e}")
             return 0
 
+    def get_latest_post_time_for_subreddit(self, subreddit: str) -> int:
+        """Get the created_utc timestamp of the most recent post in one subreddit."""
+        query = "SELECT MAX(created_utc) as latest_time FROM samsung_posts WHERE subreddit = %s"
+
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(query, (subreddit,))
+                result = cursor.fetchone()
+                return result[0] if result and result[0] else 0
+        except psycopg2.Error as e:
+            logger.error("Failed to get latest post time for r/%s: %s", subreddit, e)
+            return 0
+
     def get_latest_post_times_by_subreddit(self, subreddits: List[str]) -> Dict[str, int]:
         """Get the latest post timestamp for each subreddit."""
-        placeholders = ','.join(['%s'] * len(subreddits))
-        query = f"""
+        query = """
         SELECT subreddit, MAX(created_utc) as latest_time
         FROM samsung_posts
-        WHERE subreddit IN ({placeholders})
+        WHERE subreddit = ANY(%s)
         GROUP BY subreddit
         """
 
         result_dict = {}
 
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, subreddits)
+            with self.cursor() as cursor:
+                cursor.execute(query, (list(subreddits),))
                 results = cursor.fetchall()
 
                 # Initialize all subreddits with 0
@@ -160,21 +757,12 @@ class Database:
                     result_dict[subreddit] = 0
 
                 # Update with actual values from database
-                for row in results:
-                    result_dict[row['subreddit']] = row['latest_time'] or 0
-
-                # Enhanced debug logging with print statements
-                from datetime import datetime
-                logger.info(f"🔍 DEBUG: Latest timestamps by subreddit:")
-                print(f"🕒 DATABASE TIMESTAMPS per subreddit:")
-                for subreddit, timestamp in result_dict.items():
-                    if timestamp > 0:
-                        readable = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S UTC')
-                        logger.info(f"  📂 r/{subreddit}: {timestamp} ({readable})")
-                        print(f"   r/{subreddit}: Last post at {readable}")
-                    else:
-                        logger.info(f"  📂 r/{subreddit}: 0 (no posts)")
-                        print(f"   r/{subreddit}: No posts yet (will fetch from beginning)")
+                for subreddit, latest_time in results:
+                    result_dict[subreddit] = latest_time or 0
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    for subreddit, timestamp in result_dict.items():
+                        logger.debug("Latest post in r/%s: %s", subreddit, timestamp)
 
                 return result_dict
 
@@ -188,107 +776,96 @@ class Database:
         query = "SELECT COUNT(*) as count FROM samsung_posts"
 
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(query)
                 result = cursor.fetchone()
-                return result['count'] if result else 0
+                return result[0] if result else 0
         except psycopg2.Error as e:
             logger.error(f"Failed to get post count: {e}")
             return 0
 
-    # Twitter-specific methods
-    def create_twitter_tables(self):
-        """Create the twitter_tweets table if it doesn't exist."""
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS twitter_tweets (
-            tweet_id VARCHAR(20) PRIMARY KEY,
-            text TEXT NOT NULL,
-            author_id VARCHAR(20) NOT NULL,
-            author_username VARCHAR(50),
-            author_name VARCHAR(100),
-            author_verified BOOLEAN DEFAULT FALSE,
-            created_at VARCHAR(30),
-            created_utc BIGINT NOT NULL,
-            lang VARCHAR(10) DEFAULT 'und',
-            retweet_count INTEGER DEFAULT 0,
-            like_count INTEGER DEFAULT 0,
-            reply_count INTEGER DEFAULT 0,
-            quote_count INTEGER DEFAULT 0,
-            conversation_id VARCHAR(20),
-            in_reply_to_user_id VARCHAR(20),
-            hashtags TEXT,
-            referenced_tweets TEXT,
-            retrieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(tweet_id)
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_twitter_created_utc ON twitter_tweets(created_utc);
-        CREATE INDEX IF NOT EXISTS idx_twitter_retrieved_at ON twitter_tweets(retrieved_at);
-        CREATE INDEX IF NOT EXISTS idx_twitter_hashtags ON twitter_tweets(hashtags);
-        CREATE INDEX IF NOT EXISTS idx_twitter_author_username ON twitter_tweets(author_username);
+    def _estimate_row_count(self, table: str) -> Optional[int]:
+        """
+        Read the planner's row estimate for a table from pg_class.
+
+        Constant time regardless of table size, unlike COUNT(*), but only as fresh
+        as the last VACUUM/ANALYZE.
+
+        Returns:
+            Estimated row count, or None if the table has never been analyzed
         """
+        query = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
 
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(create_table_query)
-                self.connection.commit()
-                logger.info("Twitter tables created successfully")
-                return True
+            with self.cursor() as cursor:
+                cursor.execute(query, (table,))
+                result = cursor.fetchone()
+                return result[0] if result and result[0] >= 0 else None
         except psycopg2.Error as e:
-            logger.error(f"Failed to create Twitter tables: {e}")
-            self.connection.rollback()
-            return False
+            logger.error("Failed to estimate row count for %s: %s", table, e)
+            return None
+
+    def get_post_count_estimate(self) -> int:
+        """Get the approximate number of posts, falling back to an exact count before the first ANALYZE."""
+        estimate = self._estimate_row_count('samsung_posts')
+        return estimate if estimate is not None else self.get_post_count()
+
+    # Twitter-specific methods
+    def create_twitter_tables(self):
+        """Create the twitter_tweets table if it doesn't exist."""
+        return self.initialize_schema(('tweets',))
 
     def insert_tweet(self, tweet_data: Dict[str, Any]) -> bool:
-        """Insert a new tweet into the database."""
-        insert_query = """
-        INSERT INTO twitter_tweets
-        (tweet_id, text, author_id, author_username, author_name, author_verified,
-         created_at, created_utc, lang, retweet_count, like_count, reply_count, quote_count,
-         conversation_id, in_reply_to_user_id, hashtags, referenced_tweets)
-        VALUES (%(tweet_id)s, %(text)s, %(author_id)s, %(author_username)s, %(author_name)s, %(author_verified)s,
-                %(created_at)s, %(created_utc)s, %(lang)s, %(retweet_count)s, %(like_count)s, %(reply_count)s, %(quote_count)s,
-                %(conversation_id)s, %(in_reply_to_user_id)s, %(hashtags)s, %(referenced_tweets)s)
-        ON CONFLICT (tweet_id) DO NOTHING
+        """Insert a new tweet into the database; returns False if it already exists."""
+        row = tweet_row(tweet_data)
+        db_rows = _with_integer_ids([row], int, 'tweet')
+        if not db_rows:
+            return False
+        inserted = self._execute_prepared('insert_tweet_stmt', db_rows[0])
+        if inserted is None:
+            return bool(self.insert_tweets_batch([row]))
+        return bool(inserted)
+
+    def insert_tweets_batch(self, rows: Sequence[Tuple]) -> List[str]:
         """
+        Insert many tweets in a single statement.
+
+        Args:
+            rows: Tweet tuples with values in TWEET_COLUMNS order
 
-        # Enhanced debug logging
-        from datetime import datetime
-        tweet_time_readable = datetime.fromtimestamp(tweet_data['created_utc']).strftime('%Y-%m-%d %H:%M:%S UTC')
-        logger.info(f"🔍 DEBUG: Attempting to insert tweet {tweet_data['tweet_id']}")
-        logger.debug(f"🔍 DEBUG: Tweet details - created_utc: {tweet_data['created_utc']} ({tweet_time_readable}), "
-                    f"text: '{tweet_data['text'][:100]}...', author: @{tweet_data['author_username']}")
+        Returns:
+            IDs of the tweets that were newly inserted
+        """
+        rows = _with_integer_ids(rows, int, 'tweet')
+        if not rows:
+            return []
+
+        insert_query = f"""
+        INSERT INTO twitter_tweets ({', '.join(TWEET_COLUMNS)})
+        VALUES %s
+        ON CONFLICT (tweet_id) DO NOTHING
+        RETURNING tweet_id
+        """
 
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(insert_query, tweet_data)
-                self.connection.commit()
-                if cursor.rowcount > 0:
-                    logger.info(f"✅ DEBUG: Successfully inserted new tweet: {tweet_data['tweet_id']}")
-                    return True
-                else:
-                    logger.info(f"⚠️ DEBUG: Tweet already exists in database: {tweet_data['tweet_id']}")
-                    return False
+            with self._write_cursor() as cursor:
+                inserted = execute_values(cursor, insert_query, rows, page_size=500, fetch=True)
+                logger.debug("Batch inserted %s of %s tweets", len(inserted), len(rows))
+                return [str(row[0]) for row in inserted]
         except psycopg2.Error as e:
-            logger.error(f"❌ Database error inserting tweet {tweet_data.get('tweet_id', 'unknown')}: {e}")
-            self.connection.rollback()
-            return False
+            logger.error("❌ Database error batch inserting %s tweets: %s", len(rows), e)
+            return []
 
     def get_latest_tweet_id(self) -> Optional[str]:
-        """Get the tweet_id of the most recent tweet."""
-        query = "SELECT tweet_id FROM twitter_tweets ORDER BY created_utc DESC LIMIT 1"
+        """Get the highest stored tweet_id (tweet IDs increase with time)."""
+        query = "SELECT tweet_id FROM twitter_tweets ORDER BY tweet_id DESC LIMIT 1"
 
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(query)
                 result = cursor.fetchone()
-                latest_id = result['tweet_id'] if result else None
-
-                if latest_id:
-                    logger.info(f"🔍 DEBUG: Latest tweet ID in database: {latest_id}")
-                else:
-                    logger.info(f"🔍 DEBUG: No tweets found in database")
-
+                latest_id = str(result[0]) if result else None
+                logger.debug("Latest tweet ID in database: %s", latest_id)
                 return latest_id
         except psycopg2.Error as e:
             logger.error(f"❌ Failed to get latest tweet ID: {e}")
@@ -299,28 +876,34 @@ class Database:
         query = "SELECT COUNT(*) as count FROM twitter_tweets"
 
         try:
-            with self.connection.cursor() as cursor:
+            with self.cursor() as cursor:
                 cursor.execute(query)
                 result = cursor.fetchone()
-                return result['count'] if result else 0
+                return result[0] if result else 0
         except psycopg2.Error as e:
             logger.error(f"Failed to get tweet count: {e}")
             return 0
 
+    def get_tweet_count_estimate(self) -> int:
+        """Get the approximate number of tweets, falling back to an exact count before the first ANALYZE."""
+        estimate = self._estimate_row_count('twitter_tweets')
+        return estimate if estimate is not None else self.get_tweet_count()
+
     def get_tweets_by_hashtag(self, hashtag: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get tweets containing a specific hashtag."""
+        """Get tweets tagged with a specific hashtag (matched exactly, case-insensitively)."""
         query = """
         SELECT * FROM twitter_tweets
-        WHERE hashtags LIKE %s
+        WHERE hashtags @> ARRAY[%s]::text[]
         ORDER BY created_utc DESC
         LIMIT %s
         """
 
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, (f'%{hashtag}%', limit))
+            with self.cursor(cursor_factory=RealDictCursor) as cursor:
+                # Hashtags are stored lowercased without the leading '#'
+                cursor.execute(query, (hashtag.lstrip('#').lower(), limit))
                 results = cursor.fetchall()
-                return [dict(row) for row in results]
+                return [dict(row, tweet_id=str(row['tweet_id'])) for row in results]
         except psycopg2.Error as e:
             logger.error(f"Failed to get tweets by hashtag {hashtag}: {e}")
             return []
\ No newline at end of file
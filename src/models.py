@@ -1,7 +1,9 @@
 """Data models for Reddit posts."""
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from dataclasses import dataclass
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -57,6 +59,46 @@ class RedditPost(BaseModel):
         return self.__str__()
 
 
+@dataclass(slots=True)
+class RedditPostRecord:
+    """Unvalidated post record for the ingestion path; same fields as RedditPost."""
+
+    post_id: str
+    title: str
+    created_utc: int
+    author: str = "[deleted]"
+    score: int = 0
+    num_comments: int = 0
+    url: str = ""
+    selftext: str = ""
+    permalink: str = ""
+    subreddit: str = "samsung"
+
+    @classmethod
+    def from_reddit_data(cls, data: dict) -> 'RedditPostRecord':
+        """Create a record from RedditClient output, which already has every field in its final type."""
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        """Convert record to dictionary for database insertion."""
+        return {
+            'post_id': self.post_id,
+            'title': self.title,
+            'author': self.author,
+            'created_utc': self.created_utc,
+            'score': self.score,
+            'num_comments': self.num_comments,
+            'url': self.url,
+            'selftext': self.selftext,
+            'permalink': self.permalink,
+            'subreddit': self.subreddit
+        }
+
+    def to_pydantic(self) -> RedditPost:
+        """Convert to a validated RedditPost."""
+        return RedditPost(**self.to_dict())
+
+
 class MonitorStats(BaseModel):
     """Statistics for the monitoring session."""
 
@@ -65,7 +107,7 @@ class MonitorStats(BaseModel):
     errors_count: int = Field(default=0, description="Number of errors encountered")
     start_time: datetime = Field(default_factory=datetime.now, description="Session start time")
     last_fetch_time: Optional[datetime] = Field(default=None, description="Last successful fetch time")
-    last_post_time: Optional[int] = Field(default=None, description="Unix timestamp of most recent post")
+    last_post_times: Dict[str, int] = Field(default_factory=dict, description="Unix timestamp of most recent stored post per subreddit")
 
     def add_fetch_result(self, posts_fetched: int, new_posts: int):
         """Update stats after a fetch operation."""
@@ -90,6 +132,9 @@ class MonitorStats(BaseModel):
 class Config(BaseModel):
     """Application configuration model."""
 
+    # Immutable, so the instance cached by from_env() can be shared safely
+    model_config = ConfigDict(frozen=True)
+
     db_host: str = Field(default="localhost", description="Database host")
     db_user: str = Field(default="adgear", description="Database user")
     db_password: str = Field(default="", description="Database password")
@@ -104,8 +149,9 @@ class Config(BaseModel):
     user_agent: str = Field(default="RedditMultiMonitor/1.0", description="User agent for requests")
 
     @classmethod
+    @lru_cache(maxsize=None)
     def from_env(cls) -> 'Config':
-        """Create config from environment variables."""
+        """Create config from environment variables (parsed once per process)."""
         import os
 
         # Parse subreddits from environment variable (comma-separated)
@@ -5,25 +5,38 @@ import time
 import sys
 from typing import Optional
 
-from .database import Database
+from .database import Database, post_row
 from .reddit_client import RedditClient
-from .models import RedditPost, MonitorStats
+from .models import Config, RedditPostRecord, MonitorStats
+from .recent_ids import RecentIds
 from .config import setup_logging, load_environment, get_config_from_env, validate_config, print_config_summary
 
 
 logger = logging.getLogger(__name__)
 
+# Seconds between periodic statistics lines in the monitoring loop
+STATS_LOG_INTERVAL = 300
+
 
 class RedditMonitor:
     """Main service for monitoring Reddit posts."""
 
-    def __init__(self):
-        """Initialize the Reddit monitor."""
-        self.config = None
+    def __init__(self, config: Optional[Config] = None):
+        """
+        Initialize the Reddit monitor.
+
+        Args:
+            config: Configuration to use instead of loading .env and the environment
+        """
+        self.config = config
         self.database: Optional[Database] = None
         self.reddit_client: Optional[RedditClient] = None
         self.stats = MonitorStats()
         self.running = False
+        # time.monotonic() deadline for the next periodic statistics line
+        self._next_stats_at = 0.0
+        # Post IDs stored this session, so re-served posts are dropped before reaching the database
+        self.recent_post_ids = RecentIds(maxlen=10_000)
 
     def initialize(self) -> bool:
         """
@@ -33,9 +46,10 @@ class RedditMonitor:
             True if initialization successful, False otherwise
         """
         try:
-            # Load environment and configuration
-            load_environment()
-            self.config = get_config_from_env()
+            # Load environment and configuration unless one was supplied
+            if self.config is None:
+                load_environment()
+                self.config = get_config_from_env()
 
             # Set up logging
             setup_logging(self.config.log_level)
@@ -66,8 +80,14 @@ class RedditMonitor:
                 logger.error("Failed to create database tables")
                 return False
 
+            # Seed the per-subreddit high-water marks once; each cycle advances them in memory
+            self.stats.last_post_times = self.database.get_latest_post_times_by_subreddit(self.config.subreddits)
+
             # Initialize Reddit client
-            self.reddit_client = RedditClient(user_agent=self.config.user_agent)
+            self.reddit_client = RedditClient(
+                user_agent=self.config.user_agent,
+                max_concurrency=len(self.config.subreddits)
+            )
 
             # Test Reddit API connection
             if not self.reddit_client.test_connection():
@@ -75,20 +95,20 @@ class RedditMonitor:
                 return False
 
             # Get subreddit info for all configured subreddits
-            logger.info(f"🔄 DEBUG: Monitoring {len(self.config.subreddits)} subreddits: {', '.join(self.config.subreddits)}")
+            logger.info("🔄 DEBUG: Monitoring %s subreddits: %s", len(self.config.subreddits), ', '.join(self.config.subreddits))
             for subreddit in self.config.subreddits:
                 subreddit_info = self.reddit_client.get_subreddit_info(subreddit)
                 if subreddit_info:
-                    logger.info(f"📂 DEBUG: r/{subreddit_info['display_name']} - "
-                               f"{subreddit_info['subscribers']} subscribers")
+                    logger.info("📂 DEBUG: r/%s - %s subscribers", subreddit_info['display_name'], subreddit_info['subscribers'])
                 else:
-                    logger.warning(f"⚠️ DEBUG: Could not get info for r/{subreddit}")
+                    logger.warning("⚠️ DEBUG: Could not get info for r/%s", subreddit)
 
+            self._next_stats_at = time.monotonic() + STATS_LOG_INTERVAL
             logger.info("Monitor initialized successfully")
             return True
 
         except Exception as e:
-            logger.error(f"Failed to initialize monitor: {e}")
+            logger.error("Failed to initialize monitor: %s", e)
             return False
 
     def fetch_and_store_posts(self) -> int:
@@ -98,90 +118,94 @@ class RedditMonitor:
         Returns:
             Number of new posts stored
         """
-        from datetime import datetime
-        cycle_start = datetime.now()
-        logger.info(f"🔄 DEBUG: Starting fetch cycle at {cycle_start.strftime('%Y-%m-%d %H:%M:%S')}")
+        cycle_start = time.perf_counter()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🔄 DEBUG: Starting fetch cycle at %s", time.strftime('%Y-%m-%d %H:%M:%S'))
 
         try:
-            # Get the timestamp of the most recent post for each subreddit
-            latest_timestamps = self.database.get_latest_post_times_by_subreddit(self.config.subreddits)
-
             # Fetch new posts from all subreddits
-            logger.info(f"🔍 DEBUG: Calling Reddit API for new posts from {len(self.config.subreddits)} subreddits...")
+            logger.info("🔍 DEBUG: Calling Reddit API for new posts from %s subreddits...", len(self.config.subreddits))
             raw_posts = self.reddit_client.fetch_posts_from_multiple_subreddits(
                 subreddits=self.config.subreddits,
                 limit_per_subreddit=self.config.batch_size,
-                after_timestamps=latest_timestamps
+                after_timestamps=self.stats.last_post_times
             )
 
             if not raw_posts:
                 logger.info("⚠️ DEBUG: No new posts fetched from Reddit API")
-                print("⚠️ DEBUG: No new posts fetched from Reddit API")
                 self.stats.add_fetch_result(0, 0)
                 return 0
 
-            logger.info(f"🔍 DEBUG: Processing {len(raw_posts)} posts for database storage...")
+            fresh_posts = [post_data for post_data in raw_posts if post_data['post_id'] not in self.recent_post_ids]
+            if len(fresh_posts) < len(raw_posts):
+                logger.info("🔍 DEBUG: Skipping %s posts already stored this session", len(raw_posts) - len(fresh_posts))
 
-            # Convert raw posts to RedditPost models and store them
-            new_posts_count = 0
-            for i, post_data in enumerate(raw_posts, 1):
-                try:
-                    logger.debug(f"🔍 DEBUG: Processing post {i}/{len(raw_posts)}: {post_data['post_id']}")
-                    reddit_post = RedditPost.from_reddit_data(post_data)
+            logger.info("🔍 DEBUG: Processing %s posts for database storage...", len(fresh_posts))
 
-                    if self.database.insert_post(reddit_post.to_dict()):
-                        new_posts_count += 1
-                        logger.info(f"✅ DEBUG: Successfully stored post {new_posts_count}: {reddit_post.post_id} - {reddit_post.title[:80]}...")
-
-                        # Update the most recent post timestamp
-                        if self.stats.last_post_time is None or reddit_post.created_utc > self.stats.last_post_time:
-                            self.stats.last_post_time = reddit_post.created_utc
-                            logger.debug(f"🔍 DEBUG: Updated latest timestamp to {reddit_post.created_utc}")
+            # Wrap raw posts in slotted records; RedditClient already produced the final schema
+            reddit_posts = {}
+            log_each_post = logger.isEnabledFor(logging.DEBUG)
+            for i, post_data in enumerate(fresh_posts, 1):
+                try:
+                    if log_each_post:
+                        logger.debug("🔍 DEBUG: Processing post %s/%s: %s", i, len(fresh_posts), post_data['post_id'])
+                    reddit_post = RedditPostRecord.from_reddit_data(post_data)
+                    reddit_posts[reddit_post.post_id] = reddit_post
 
                 except Exception as e:
-                    logger.error(f"❌ DEBUG: Failed to process post {post_data.get('post_id', 'unknown')}: {e}")
+                    logger.error("❌ DEBUG: Failed to process post %s: %s", post_data.get('post_id', 'unknown'), e)
                     self.stats.add_error()
 
+            # Store the whole cycle in one batch insert and read the new total in the same transaction
+            with self.database.transaction():
+                inserted_ids = self.database.insert_posts_batch(
+                    [post_row(reddit_post.to_dict()) for reddit_post in reddit_posts.values()]
+                )
+                # Planner estimate; an exact COUNT(*) scans the whole table every cycle
+                total_posts = self.database.get_post_count_estimate()
+            new_posts_count = len(inserted_ids)
+
+            # Per-post lines only at DEBUG; building them costs more than the batch insert at INFO
+            for stored_count, post_id in enumerate(inserted_ids, 1):
+                reddit_post = reddit_posts[post_id]
+                self.recent_post_ids.add(post_id)
+                if log_each_post:
+                    logger.debug("✅ DEBUG: Successfully stored post %s: %s - %.80s...", stored_count, reddit_post.post_id, reddit_post.title)
+
+                # Advance the subreddit's high-water mark for the next cycle
+                if reddit_post.created_utc > self.stats.last_post_times.get(reddit_post.subreddit, 0):
+                    self.stats.last_post_times[reddit_post.subreddit] = reddit_post.created_utc
+                    if log_each_post:
+                        logger.debug("🔍 DEBUG: Updated latest timestamp to %s", reddit_post.created_utc)
+
             # Update statistics
             self.stats.add_fetch_result(len(raw_posts), new_posts_count)
 
             # Enhanced results logging
-            cycle_end = datetime.now()
-            cycle_duration = (cycle_end - cycle_start).total_seconds()
-
-            # Enhanced results with print statements
-            total_posts = self.database.get_post_count()
+            cycle_duration = time.perf_counter() - cycle_start
 
             if new_posts_count > 0:
-                logger.info(f"🎉 DEBUG: Cycle complete! Stored {new_posts_count} new posts in {cycle_duration:.1f}s. "
-                           f"Total posts in database: {total_posts}")
-                print(f"💾 DATABASE: Inserted {new_posts_count} new posts in {cycle_duration:.1f}s")
-                print(f"📊 DATABASE: Total posts stored: {total_posts}")
-
+                logger.info("🎉 DEBUG: Cycle complete! Stored %s new posts in %.1fs. "
+                            "Total posts in database: ~%s", new_posts_count, cycle_duration, total_posts)
                 # Show breakdown by subreddit
                 subreddit_counts = {}
                 for post_data in raw_posts:
                     subreddit = post_data.get('subreddit', 'unknown')
                     subreddit_counts[subreddit] = subreddit_counts.get(subreddit, 0) + 1
 
-                print("📈 BREAKDOWN by subreddit:")
-                for subreddit, count in subreddit_counts.items():
-                    print(f"   r/{subreddit}: {count} posts processed")
+                logger.info("📈 BREAKDOWN by subreddit: %s",
+                            ", ".join(f"r/{subreddit}: {count}" for subreddit, count in subreddit_counts.items()))
 
             else:
-                logger.info(f"⚠️ DEBUG: Cycle complete! No new posts to store (all {len(raw_posts)} posts were duplicates). "
-                           f"Cycle took {cycle_duration:.1f}s")
-                print(f"⚠️  DATABASE: No new posts inserted ({len(raw_posts)} were duplicates)")
-                print(f"📊 DATABASE: Total posts in database: {total_posts}")
+                logger.info("⚠️ DEBUG: Cycle complete! No new posts to store (all %s posts were duplicates). "
+                            "Cycle took %.1fs. Total posts in database: ~%s", len(raw_posts), cycle_duration, total_posts)
 
-            logger.info(f"📊 DEBUG: Current stats - {self.stats}")
-            print(f"⏱️  CYCLE: Completed in {cycle_duration:.1f} seconds")
+            logger.info("📊 DEBUG: Current stats - %s", self.stats)
             return new_posts_count
 
         except Exception as e:
-            logger.error(f"❌ DEBUG: Error during fetch and store operation: {e}")
-            import traceback
-            logger.debug(f"🔍 DEBUG: Full traceback: {traceback.format_exc()}")
+            logger.error("❌ DEBUG: Error during fetch and store operation: %s", e)
+            logger.debug("🔍 DEBUG: Full traceback", exc_info=True)
             self.stats.add_error()
             return 0
 
@@ -194,9 +218,11 @@ class RedditMonitor:
             sys.exit(1)
 
         self.running = True
-        logger.info(f"Starting monitoring loop with {self.config.poll_interval}s intervals...")
+        logger.info("Starting monitoring loop with %ss intervals...", self.config.poll_interval)
 
         try:
+            # Cycles start on a fixed monotonic cadence, so cycle time doesn't stretch the interval
+            next_tick = time.monotonic()
             while self.running:
                 logger.debug("Starting fetch cycle...")
 
@@ -204,18 +230,26 @@ class RedditMonitor:
                 new_posts = self.fetch_and_store_posts()
 
                 # Log periodic statistics
-                runtime = self.stats.get_runtime_seconds()
-                if runtime % 300 == 0 and runtime > 0:  # Log every 5 minutes
-                    logger.info(f"Stats: {self.stats}")
+                now = time.monotonic()
+                if now >= self._next_stats_at:
+                    self._next_stats_at = now + STATS_LOG_INTERVAL
+                    logger.info("Stats: %s", self.stats)
 
                 # Wait for next cycle
-                logger.debug(f"Waiting {self.config.poll_interval} seconds until next fetch...")
-                time.sleep(self.config.poll_interval)
+                next_tick += self.config.poll_interval
+                sleep_time = next_tick - time.monotonic()
+                if sleep_time > 0:
+                    logger.debug("Waiting %.1f seconds until next fetch...", sleep_time)
+                    time.sleep(sleep_time)
+                else:
+                    # Overran the interval; start the next cycle now instead of bursting to catch up
+                    logger.warning("Cycle overran the %ss poll interval by %.1fs", self.config.poll_interval, -sleep_time)
+                    next_tick = time.monotonic()
 
         except KeyboardInterrupt:
             logger.info("Received shutdown signal")
         except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}")
+            logger.error("Unexpected error in main loop: %s", e)
         finally:
             self.shutdown()
 
@@ -227,7 +261,11 @@ class RedditMonitor:
         self.running = False
 
         # Log final statistics
-        logger.info(f"Final stats: {self.stats}")
+        logger.info("Final stats: %s", self.stats)
+
+        # Close pooled Reddit API connections
+        if self.reddit_client:
+            self.reddit_client.close()
 
         # Close database connection
         if self.database:
@@ -0,0 +1,102 @@
+"""Token-bucket rate limiter for Reddit API requests."""
+
+import logging
+import threading
+import time
+from typing import Mapping, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Reddit allows roughly 60 requests/minute for OAuth clients and 30 for anonymous ones
+OAUTH_REQUESTS_PER_MINUTE = 60
+ANONYMOUS_REQUESTS_PER_MINUTE = 30
+
+
+class RateLimiter:
+    """Token bucket that also honours Reddit's X-Ratelimit-* response headers."""
+
+    def __init__(self,
+                 requests_per_minute: float = ANONYMOUS_REQUESTS_PER_MINUTE,
+                 burst: Optional[int] = None,
+                 low_remaining: float = 2):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Sustained request rate the bucket refills at
+            burst: Bucket capacity (defaults to one minute worth of requests)
+            low_remaining: Pause until reset once Reddit reports fewer remaining requests
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or requests_per_minute)
+        self.low_remaining = low_remaining
+
+        self.remaining: Optional[float] = None
+        self.used: Optional[float] = None
+        self.reset: Optional[float] = None
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        # Waiters sleep on the condition, releasing the lock so header updates are never held up
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last refill."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        with self._ready:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+
+                # Re-check after the wait or as soon as update_from_headers changes the budget
+                self._ready.wait(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Sync the bucket with Reddit's view of the remaining request budget.
+
+        Args:
+            headers: Response headers from a Reddit API call
+        """
+        remaining = _header_float(headers, 'X-Ratelimit-Remaining')
+        used = _header_float(headers, 'X-Ratelimit-Used')
+        reset = _header_float(headers, 'X-Ratelimit-Reset')
+
+        if remaining is None or reset is None:
+            return
+
+        with self._ready:
+            self.remaining, self.used, self.reset = remaining, used, reset
+            self._tokens = min(self._tokens, remaining)
+
+            if remaining < self.low_remaining:
+                delay = reset / max(remaining, 1)
+                self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+                logger.info("Reddit rate limit nearly exhausted (%.0f left, %.0f used), pausing %.1fs",
+                            remaining, used or 0, delay)
+            self._ready.notify_all()
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Parse a numeric header value, returning None if missing or malformed."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,33 @@
+"""Bounded LRU set of recently seen IDs."""
+
+from collections import OrderedDict
+
+
+class RecentIds:
+    """Set of IDs that evicts the least recently seen entry once full."""
+
+    def __init__(self, maxlen: int = 10_000):
+        """
+        Initialize an empty set.
+
+        Args:
+            maxlen: Maximum number of IDs to remember
+        """
+        self.maxlen = maxlen
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, item: str) -> None:
+        """Remember an ID, evicting the oldest one if the set is full."""
+        self._ids[item] = None
+        self._ids.move_to_end(item)
+        if len(self._ids) > self.maxlen:
+            self._ids.popitem(last=False)
+
+    def __contains__(self, item: str) -> bool:
+        if item in self._ids:
+            self._ids.move_to_end(item)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -1,27 +1,68 @@
 """Reddit API client for fetching posts."""
 
+import heapq
+import operator
+import orjson
 import requests
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
 import os
 
+from .rate_limiter import RateLimiter
+
 
 logger = logging.getLogger(__name__)
 
+PERMALINK_PREFIX = "https://reddit.com"
+
+# Reddit listing fields read by _extract_post_data, with the values used when one is missing
+_POST_DEFAULTS = {
+    'id': '',
+    'title': '',
+    'author': '[deleted]',
+    'created_utc': 0,
+    'score': 0,
+    'num_comments': 0,
+    'url': '',
+    'selftext': '',
+    'permalink': '',
+    'subreddit': 'samsung'
+}
+_POST_FIELDS = operator.itemgetter(*_POST_DEFAULTS)
+_CREATED_UTC = operator.itemgetter('created_utc')
+
+
+def _format_utc(timestamp: float) -> str:
+    """Format a Unix timestamp for log output."""
+    return time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime(timestamp))
+
 
 class RedditClient:
     """Reddit API client for fetching posts from subreddits."""
 
-    def __init__(self, user_agent: Optional[str] = None):
-        """Initialize Reddit client."""
+    def __init__(self, user_agent: Optional[str] = None, max_concurrency: int = 4):
+        """
+        Initialize Reddit client.
+
+        Args:
+            user_agent: User-Agent header sent with every request
+            max_concurrency: Subreddits fetched in parallel by fetch_posts_from_multiple_subreddits
+        """
         self.user_agent = user_agent or os.getenv('USER_AGENT', 'RedditSamsungMonitor/1.0')
         self.base_url = "https://www.reddit.com"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': self.user_agent
         })
-        self.rate_limit_delay = 2  # Minimum delay between requests in seconds
+        self.max_concurrency = max(1, max_concurrency)
+        # One keep-alive connection per concurrent fetch, all to www.reddit.com
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency, pool_block=True)
+        self.session.mount('https://', adapter)
+        # Shared across fetch threads so parallel subreddits still respect Reddit's global limit
+        self.rate_limiter = RateLimiter()
 
     def fetch_new_posts(self, subreddit: str = "technology", limit: int = 25, after: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -33,15 +74,13 @@ class RedditClient:
             after: Unix timestamp to fetch posts after (for pagination)
 
         Returns:
-            List of post dictionaries
+            List of post dictionaries, newest first
         """
-        from datetime import datetime
-
         # Special handling for initial fetch (after=0 or None)
         is_initial_fetch = after is None or after == 0
 
         if is_initial_fetch:
-            logger.info(f"🏁 DEBUG: Initial fetch for r/{subreddit} - getting oldest posts first")
+            logger.info("🏁 DEBUG: Initial fetch for r/%s - getting oldest posts first", subreddit)
             # For initial fetch, get more posts and select the oldest ones
             fetch_limit = min(100, limit * 4)  # Fetch more to get a good selection of older posts
         else:
@@ -53,87 +92,87 @@ class RedditClient:
             'raw_json': 1  # Prevent HTML encoding
         }
 
-        print(f"Fetching new posts from r/{subreddit} with limit {limit} and after {after}")
         posts = []
 
-        # Enhanced debug logging
-        after_readable = datetime.fromtimestamp(after).strftime('%Y-%m-%d %H:%M:%S UTC') if after else "None"
-        logger.info(f"🔍 DEBUG: Starting fetch from r/{subreddit}")
-        logger.info(f"🔍 DEBUG: Request params - limit: {fetch_limit}, after timestamp: {after} ({after_readable})")
-        logger.info(f"🔍 DEBUG: Request URL: {url}")
+        # Only build the debug strings (timestamp conversions, header dumps) when they will be emitted
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            after_readable = _format_utc(after) if after else "None"
+            logger.debug("🔍 DEBUG: Starting fetch from r/%s", subreddit)
+            logger.debug("🔍 DEBUG: Request params - limit: %s, after timestamp: %s (%s)", fetch_limit, after, after_readable)
+            logger.debug("🔍 DEBUG: Request URL: %s", url)
 
         try:
+            self.rate_limiter.acquire()
             response = self.session.get(url, params=params, timeout=30)
+            self.rate_limiter.update_from_headers(response.headers)
             response.raise_for_status()
 
-            logger.debug(f"🔍 DEBUG: HTTP Status: {response.status_code}")
-            logger.debug(f"🔍 DEBUG: Response headers: {dict(response.headers)}")
+            if debug:
+                logger.debug("🔍 DEBUG: HTTP Status: %s", response.status_code)
+                logger.debug("🔍 DEBUG: Response headers: %s", dict(response.headers))
 
-            data = response.json()
+            data = orjson.loads(response.content)
 
             if 'data' not in data or 'children' not in data['data']:
-                logger.warning(f"❌ DEBUG: Unexpected response structure from Reddit API")
-                logger.debug(f"🔍 DEBUG: Response structure: {list(data.keys()) if data else 'None'}")
+                logger.warning("❌ DEBUG: Unexpected response structure from Reddit API")
+                logger.debug("🔍 DEBUG: Response structure: %s", list(data.keys()) if data else 'None')
                 return posts
 
             total_posts_fetched = len(data['data']['children'])
-            logger.info(f"🔍 DEBUG: Reddit returned {total_posts_fetched} total posts")
+            logger.info("🔍 DEBUG: Reddit returned %s total posts", total_posts_fetched)
 
             # Extract all posts first
             all_posts = []
             for i, post in enumerate(data['data']['children']):
                 if post['kind'] == 't3':  # 't3' indicates a link/post
                     post_data = self._extract_post_data(post['data'])
-                    post_time_readable = datetime.fromtimestamp(post_data['created_utc']).strftime('%Y-%m-%d %H:%M:%S UTC')
 
-                    logger.debug(f"🔍 DEBUG: Post {i+1}: ID={post_data['post_id']}, "
-                               f"created_utc={post_data['created_utc']} ({post_time_readable}), "
-                               f"title='{post_data['title'][:50]}...'")
+                    if not is_initial_fetch and post_data['created_utc'] <= after:
+                        # /new is newest first, so this post and everything after it is already stored
+                        break
+
+                    if debug:
+                        post_time_readable = _format_utc(post_data['created_utc'])
+                        logger.debug("🔍 DEBUG: Post %s: ID=%s, created_utc=%s (%s), title='%.50s...'",
+                                     i + 1, post_data['post_id'], post_data['created_utc'], post_time_readable, post_data['title'])
 
                     all_posts.append(post_data)
 
             # Handle initial fetch vs ongoing fetch differently
             if is_initial_fetch:
                 # For initial fetch, sort by timestamp (oldest first) and take the oldest posts
-                all_posts.sort(key=lambda x: x.get('created_utc', 0))
+                all_posts.sort(key=_CREATED_UTC)
                 posts = all_posts[:limit]  # Take the oldest N posts
-                logger.info(f"🏁 DEBUG: Initial fetch - selected {len(posts)} oldest posts from {len(all_posts)} available")
-                if posts:
-                    oldest_time = datetime.fromtimestamp(posts[0]['created_utc']).strftime('%Y-%m-%d %H:%M:%S UTC')
-                    newest_time = datetime.fromtimestamp(posts[-1]['created_utc']).strftime('%Y-%m-%d %H:%M:%S UTC')
-                    logger.info(f"🏁 DEBUG: Time range - oldest: {oldest_time}, newest: {newest_time}")
+                logger.info("🏁 DEBUG: Initial fetch - selected %s oldest posts from %s available", len(posts), len(all_posts))
+                if posts and logger.isEnabledFor(logging.INFO):
+                    oldest_time = _format_utc(posts[0]['created_utc'])
+                    newest_time = _format_utc(posts[-1]['created_utc'])
+                    logger.info("🏁 DEBUG: Time range - oldest: %s, newest: %s", oldest_time, newest_time)
+                # Same newest-first order as the ongoing path (and Reddit's listing)
+                posts.reverse()
             else:
-                # For ongoing fetch, filter posts newer than 'after' timestamp
-                filtered_count = 0
-                for post_data in all_posts:
-                    if post_data['created_utc'] > after:
-                        posts.append(post_data)
-                        logger.debug(f"✅ DEBUG: Post {post_data['post_id']} included (newer than filter)")
-                    else:
-                        filtered_count += 1
-                        logger.debug(f"❌ DEBUG: Post {post_data['post_id']} filtered out (older than {after})")
-
-                logger.info(f"🔍 DEBUG: Ongoing fetch - {len(posts)} new posts, {filtered_count} filtered out")
+                # For ongoing fetch, extraction already stopped at the first post not newer than 'after'
+                posts = all_posts
+                filtered_count = total_posts_fetched - len(posts)
 
-            logger.info(f"✅ Fetched {len(posts)} posts from r/{subreddit} (out of {total_posts_fetched} total)")
+                logger.info("🔍 DEBUG: Ongoing fetch - %s new posts, %s filtered out", len(posts), filtered_count)
 
-            # Respect rate limits
-            time.sleep(self.rate_limit_delay)
+            logger.info("✅ Fetched %s posts from r/%s (out of %s total)", len(posts), subreddit, total_posts_fetched)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Network error fetching from Reddit: {e}")
+            logger.error("❌ Network error fetching from Reddit: %s", e)
         except ValueError as e:
-            logger.error(f"❌ JSON parsing error: {e}")
+            logger.error("❌ JSON parsing error: %s", e)
         except Exception as e:
-            logger.error(f"❌ Unexpected error while fetching posts: {e}")
-            import traceback
-            logger.debug(f"🔍 DEBUG: Full traceback: {traceback.format_exc()}")
+            logger.error("❌ Unexpected error while fetching posts: %s", e)
+            logger.debug("🔍 DEBUG: Full traceback", exc_info=True)
 
         return posts
 
     def fetch_posts_from_multiple_subreddits(self, subreddits: List[str], limit_per_subreddit: int = 25, after_timestamps: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
         """
-        Fetch new posts from multiple subreddits.
+        Fetch new posts from multiple subreddits in parallel.
 
         Args:
             subreddits: List of subreddit names to fetch from
@@ -141,67 +180,84 @@ class RedditClient:
             after_timestamps: Dict mapping subreddit names to timestamp filters
 
         Returns:
-            List of post dictionaries from all subreddits combined
+            List of post dictionaries from all subreddits combined, newest first
         """
-        all_posts = []
+        posts_lists = []
         after_timestamps = after_timestamps or {}
 
-        from datetime import datetime
-        overall_start = datetime.now()
+        overall_start = time.perf_counter()
 
-        logger.info(f"🔄 DEBUG: Starting multi-subreddit fetch from {len(subreddits)} subreddits: {', '.join(subreddits)}")
-        print(f"🔄 Starting fetch from {len(subreddits)} subreddits at {overall_start.strftime('%H:%M:%S')}")
+        logger.info("🔄 DEBUG: Starting multi-subreddit fetch from %s subreddits: %s", len(subreddits), ', '.join(subreddits))
 
-        for subreddit in subreddits:
-            after_time = after_timestamps.get(subreddit, None)
-            after_readable = datetime.fromtimestamp(after_time).strftime('%Y-%m-%d %H:%M:%S UTC') if after_time else "beginning of time"
+        # Requests are network-bound; the shared rate limiter keeps the combined pace in check
+        workers = min(self.max_concurrency, max(1, len(subreddits)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._fetch_subreddit, subreddit, limit_per_subreddit, after_timestamps.get(subreddit))
+                for subreddit in subreddits
+            ]
+            for future in as_completed(futures):
+                posts_lists.append(future.result())
 
-            logger.info(f"📂 DEBUG: Fetching from r/{subreddit} (after: {after_time})")
-            print(f"📂 r/{subreddit}: Searching posts newer than {after_readable}")
+        # Each subreddit's list is already newest first, so merge instead of re-sorting everything
+        all_posts = list(heapq.merge(*posts_lists, key=_CREATED_UTC, reverse=True))
 
-            try:
-                posts = self.fetch_new_posts(
-                    subreddit=subreddit,
-                    limit=limit_per_subreddit,
-                    after=after_time
-                )
+        # Log overall summary
+        duration = time.perf_counter() - overall_start
 
-                if posts:
-                    # Get time range of fetched posts
-                    post_times = [p['created_utc'] for p in posts]
-                    earliest_post = datetime.fromtimestamp(min(post_times)).strftime('%Y-%m-%d %H:%M:%S UTC')
-                    latest_post = datetime.fromtimestamp(max(post_times)).strftime('%Y-%m-%d %H:%M:%S UTC')
+        if all_posts:
+            logger.info("🎯 DEBUG: Total posts from all subreddits: %s in %.1fs", len(all_posts), duration)
+            if logger.isEnabledFor(logging.DEBUG):
+                all_times = [p['created_utc'] for p in all_posts]
+                earliest_overall = _format_utc(min(all_times))
+                latest_overall = _format_utc(max(all_times))
+                logger.debug("📅 DEBUG: Time range: %s → %s", earliest_overall, latest_overall)
+        else:
+            logger.info("⚠️ DEBUG: No new posts found in %.1fs", duration)
 
-                    logger.info(f"✅ DEBUG: Got {len(posts)} posts from r/{subreddit}")
-                    print(f"✅ r/{subreddit}: Fetched {len(posts)} posts from {earliest_post} to {latest_post}")
-                else:
-                    print(f"⚠️  r/{subreddit}: No new posts found")
+        return all_posts
 
-                all_posts.extend(posts)
+    def _fetch_subreddit(self, subreddit: str, limit: int, after_time: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch one subreddit for fetch_posts_from_multiple_subreddits, logging instead of raising.
 
-            except Exception as e:
-                logger.error(f"❌ DEBUG: Failed to fetch from r/{subreddit}: {e}")
-                print(f"❌ r/{subreddit}: Error - {e}")
+        Args:
+            subreddit: Subreddit name
+            limit: Maximum number of posts to fetch
+            after_time: Only return posts created after this Unix timestamp
 
-        # Sort by created_utc timestamp (newest first)
-        all_posts.sort(key=lambda x: x.get('created_utc', 0), reverse=True)
+        Returns:
+            List of post dictionaries (empty on failure)
+        """
+        logger.info("📂 DEBUG: Fetching from r/%s (after: %s)", subreddit, after_time)
 
-        # Print overall summary
-        overall_end = datetime.now()
-        duration = (overall_end - overall_start).total_seconds()
+        try:
+            posts = self.fetch_new_posts(
+                subreddit=subreddit,
+                limit=limit,
+                after=after_time
+            )
+
+            if posts:
+                logger.info("✅ DEBUG: Got %s posts from r/%s", len(posts), subreddit)
+                if logger.isEnabledFor(logging.DEBUG):
+                    # Get time range of fetched posts
+                    post_times = [p['created_utc'] for p in posts]
+                    earliest_post = _format_utc(min(post_times))
+                    latest_post = _format_utc(max(post_times))
+                    logger.debug("📅 DEBUG: r/%s posts range from %s to %s", subreddit, earliest_post, latest_post)
+            else:
+                logger.info("⚠️ DEBUG: No new posts found in r/%s", subreddit)
 
-        if all_posts:
-            all_times = [p['created_utc'] for p in all_posts]
-            earliest_overall = datetime.fromtimestamp(min(all_times)).strftime('%Y-%m-%d %H:%M:%S UTC')
-            latest_overall = datetime.fromtimestamp(max(all_times)).strftime('%Y-%m-%d %H:%M:%S UTC')
+            return posts
 
-            logger.info(f"🎯 DEBUG: Total posts from all subreddits: {len(all_posts)}")
-            print(f"🎯 TOTAL: {len(all_posts)} posts fetched in {duration:.1f}s")
-            print(f"📅 Time range: {earliest_overall} → {latest_overall}")
-        else:
-            print(f"⚠️  TOTAL: No new posts found in {duration:.1f}s")
+        except Exception as e:
+            logger.error("❌ DEBUG: Failed to fetch from r/%s: %s", subreddit, e)
+            return []
 
-        return all_posts
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
 
     def _extract_post_data(self, post: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -213,17 +269,24 @@ class RedditClient:
         Returns:
             Cleaned post data dictionary
         """
+        try:
+            post_id, title, author, created_utc, score, num_comments, url, selftext, permalink, subreddit = _POST_FIELDS(post)
+        except KeyError:
+            # Listings nearly always carry every field; only fill defaults when one is missing
+            post_id, title, author, created_utc, score, num_comments, url, selftext, permalink, subreddit = \
+                _POST_FIELDS({**_POST_DEFAULTS, **post})
+
         return {
-            'post_id': post.get('id', ''),
-            'title': post.get('title', ''),
-            'author': post.get('author', '[deleted]'),
-            'created_utc': int(post.get('created_utc', 0)),
-            'score': post.get('score', 0),
-            'num_comments': post.get('num_comments', 0),
-            'url': post.get('url', ''),
-            'selftext': post.get('selftext', ''),
-            'permalink': f"https://reddit.com{post.get('permalink', '')}" if post.get('permalink') else '',
-            'subreddit': post.get('subreddit', 'samsung')
+            'post_id': post_id,
+            'title': title,
+            'author': author,
+            'created_utc': int(created_utc),
+            'score': score,
+            'num_comments': num_comments,
+            'url': url,
+            'selftext': selftext,
+            'permalink': PERMALINK_PREFIX + permalink if permalink else '',
+            'subreddit': subreddit
         }
 
     def test_connection(self) -> bool:
@@ -234,9 +297,11 @@ class RedditClient:
             True if connection is successful, False otherwise
         """
         try:
+            self.rate_limiter.acquire()
             response = self.session.get(f"{self.base_url}/r/samsung/new.json?limit=1", timeout=10)
+            self.rate_limiter.update_from_headers(response.headers)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             if 'data' in data and 'children' in data['data']:
                 logger.info("Successfully connected to Reddit API")
@@ -246,7 +311,7 @@ class RedditClient:
                 return False
 
         except Exception as e:
-            logger.error(f"Failed to connect to Reddit API: {e}")
+            logger.error("Failed to connect to Reddit API: %s", e)
             return False
 
     def get_subreddit_info(self, subreddit: str = "samsung") -> Optional[Dict[str, Any]]:
@@ -261,10 +326,12 @@ class RedditClient:
         """
         try:
             url = f"{self.base_url}/r/{subreddit}/about.json"
+            self.rate_limiter.acquire()
             response = self.session.get(url, timeout=10)
+            self.rate_limiter.update_from_headers(response.headers)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             if 'data' in data:
                 return {
                     'display_name': data['data'].get('display_name', subreddit),
@@ -274,6 +341,6 @@ class RedditClient:
                     'active_user_count': data['data'].get('active_user_count', 0)
                 }
         except Exception as e:
-            logger.error(f"Failed to get subreddit info for r/{subreddit}: {e}")
+            logger.error("Failed to get subreddit info for r/%s: %s", subreddit, e)
 
         return None
\ No newline at end of file
@@ -1,20 +1,86 @@
 """Twitter API client for hashtag monitoring."""
 
+import itertools
 import logging
+import orjson
+import re
 import requests
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
+from types import MappingProxyType
+
+from .twitter_models import ProcessedTweet, iso_to_unix
 
 
 logger = logging.getLogger(__name__)
 
+# Recent search rejects queries longer than this (Basic access)
+MAX_QUERY_LENGTH = 512
+
+# Sub-queries searched in parallel; also the connection pool size so every worker has a connection
+MAX_CONCURRENT_QUERIES = 4
+
+# How long rate limit headers and a successful connection test are reused before re-querying
+RATE_LIMIT_CACHE_SECONDS = 30
+CONNECTION_TEST_CACHE_SECONDS = 300
+
+# Fallback wait for an exhausted bearer token whose reset header is missing (one rate limit window)
+RATE_LIMIT_WINDOW_SECONDS = 15 * 60
+
+_HASHTAG_RE = re.compile(r'#(\w+)')
+
+# Search parameters that are the same on every request
+_BASE_PARAMS = MappingProxyType({
+    'tweet.fields': 'id,text,author_id,created_at,public_metrics,context_annotations,lang,conversation_id,in_reply_to_user_id,referenced_tweets',
+    'expansions': 'author_id',
+    'user.fields': 'username,name,verified,public_metrics'
+})
+
+# Shared read-only stand-in for a missing object in the API response
+_EMPTY: Dict[str, Any] = {}
+
+# Author used when a tweet's user is missing from the response includes
+_EMPTY_USER: Dict[str, Any] = {'username': 'unknown', 'name': 'Unknown User', 'verified': False}
+
+
+@lru_cache(maxsize=4)
+def _build_queries(hashtags: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Split hashtags into OR queries that each fit within MAX_QUERY_LENGTH.
+
+    Cached because the configured hashtags are the same on every poll.
+    """
+    queries = []
+    current = ""
+    for hashtag in hashtags:
+        term = f"#{hashtag}"
+        candidate = f"{current} OR {term}" if current else term
+        if current and len(candidate) > MAX_QUERY_LENGTH:
+            queries.append(current)
+            candidate = term
+        current = candidate
+    if current:
+        queries.append(current)
+    return tuple(queries)
+
 
 class TwitterClient:
     """Twitter API v2 client for hashtag monitoring."""
 
-    def __init__(self, bearer_token: str, user_agent: str = "XHashtagMonitor/1.0"):
-        """Initialize X (formerly Twitter) API client."""
+    def __init__(self, bearer_token: str, user_agent: str = "XHashtagMonitor/1.0",
+                 bearer_tokens: Optional[List[str]] = None):
+        """
+        Initialize X (formerly Twitter) API client.
+
+        Args:
+            bearer_token: Token for connection tests and rate limit checks
+            user_agent: User agent for requests
+            bearer_tokens: Tokens to rotate between for searches (defaults to bearer_token alone)
+        """
         self.bearer_token = bearer_token
         self.user_agent = user_agent
         self.base_url = "https://api.x.com/2"
@@ -23,25 +89,63 @@ class TwitterClient:
             'Authorization': f'Bearer {bearer_token}',
             'User-Agent': user_agent
         })
+        # Keep api.x.com connections alive between polls and across concurrent sub-queries
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_QUERIES, pool_block=True)
+        self.session.mount('https://', adapter)
+        # When test_connection last succeeded (time.monotonic())
+        self._connection_ok_at: Optional[float] = None
+        # Searches round-robin over the tokens; each has its own rate limit window
+        self._bearer_tokens = bearer_tokens or [bearer_token]
+        self._token_cycle = itertools.cycle(self._bearer_tokens)
+        # Guards the per-token state below, which concurrent sub-queries update
+        self._token_lock = threading.Lock()
+        # Latest search rate limit headers per token and when they were seen (time.monotonic())
+        self._rate_limits: Dict[str, Dict[str, Any]] = {}
+        self._rate_limit_checked_at: Dict[str, float] = {}
+        # Unix time until which each exhausted token is skipped
+        self._token_reset_at: Dict[str, int] = {}
+        # Search requests made by the last search_hashtags call
+        self._requests_per_poll = 1
+        # Search response handlers by status code; anything else goes to _on_search_failed
+        self._search_handlers = {
+            200: self._on_search_ok,
+            429: self._on_search_rate_limited,
+            401: self._on_search_unauthorized,
+        }
+
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
+
+    def test_connection(self, force: bool = False) -> bool:
+        """
+        Test X API connection and authentication.
+
+        Each test spends one search request, so a success is reused for
+        CONNECTION_TEST_CACHE_SECONDS unless force is set.
+        """
+        if not force and self._connection_ok_at is not None and \
+                time.monotonic() - self._connection_ok_at < CONNECTION_TEST_CACHE_SECONDS:
+            return True
 
-    def test_connection(self) -> bool:
-        """Test X API connection and authentication."""
         try:
             # Use tweets/search/recent endpoint for testing as it supports Bearer token
             url = f"{self.base_url}/tweets/search/recent"
             params = {'query': 'test', 'max_results': 10}
             response = self.session.get(url, params=params)
+            self._record_rate_limit(response)
 
             if response.status_code == 200:
                 logger.info("✅ X API connection test successful")
+                self._connection_ok_at = time.monotonic()
                 return True
             elif response.status_code == 401:
                 logger.error("❌ X API authentication failed - check bearer token")
-                logger.error(f"❌ Response: {response.text}")
+                logger.error("❌ Response: %s", response.text)
                 return False
             elif response.status_code == 403:
                 logger.error("❌ X API access forbidden (403)")
-                logger.error(f"❌ Response: {response.text}")
+                logger.error("❌ Response: %s", response.text)
                 logger.error("💡 Common causes:")
                 logger.error("   - Invalid Bearer token format")
                 logger.error("   - Token doesn't have required permissions")
@@ -49,159 +153,285 @@ class TwitterClient:
                 logger.error("   - Using wrong API endpoint (try api.x.com instead of api.twitter.com)")
                 return False
             else:
-                logger.error(f"❌ X API connection test failed: {response.status_code}")
-                logger.error(f"❌ Response: {response.text}")
+                logger.error("❌ X API connection test failed: %s", response.status_code)
+                logger.error("❌ Response: %s", response.text)
                 return False
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Network error testing X API connection: {e}")
+            logger.error("❌ Network error testing X API connection: %s", e)
             return False
 
     def search_hashtags(self, hashtags: List[str], max_results: int = 100,
-                       since_id: Optional[str] = None) -> List[Dict[str, Any]]:
+                       since_id: Optional[str] = None) -> List[ProcessedTweet]:
         """
         Search for tweets containing specific hashtags.
 
+        Hashtags are combined into as few OR queries as fit the search query
+        length limit; when more than one query is needed they run concurrently.
+
         Args:
             hashtags: List of hashtags to search for (without # symbol)
+            max_results: Maximum number of tweets to return per query (10-100)
+            since_id: Only return tweets newer than this tweet ID
+
+        Returns:
+            List of processed tweets
+        """
+        queries = _build_queries(tuple(hashtags))
+        self._requests_per_poll = len(queries)
+        if len(queries) == 1:
+            return self._search_query(queries[0], max_results, since_id)
+
+        with ThreadPoolExecutor(max_workers=min(len(queries), MAX_CONCURRENT_QUERIES)) as executor:
+            results = executor.map(lambda query: self._search_query(query, max_results, since_id), queries)
+
+            # A tweet matching hashtags from two queries is returned by both
+            processed_tweets = {}
+            for tweets in results:
+                for tweet in tweets:
+                    processed_tweets.setdefault(tweet.tweet_id, tweet)
+
+        return list(processed_tweets.values())
+
+    def _search_query(self, query: str, max_results: int, since_id: Optional[str]) -> List[ProcessedTweet]:
+        """
+        Run one recent-search query.
+
+        Args:
+            query: Search query (hashtags joined with OR)
             max_results: Maximum number of tweets to return (10-100)
             since_id: Only return tweets newer than this tweet ID
 
         Returns:
-            List of tweet data dictionaries
+            List of processed tweets
         """
         try:
-            # Build search query - combine hashtags with OR
-            query = " OR ".join([f"#{hashtag}" for hashtag in hashtags])
-
             # API parameters
-            params = {
-                'query': query,
-                'max_results': min(max_results, 100),  # Twitter API limit
-                'tweet.fields': 'id,text,author_id,created_at,public_metrics,context_annotations,lang,conversation_id,in_reply_to_user_id,referenced_tweets',
-                'expansions': 'author_id',
-                'user.fields': 'username,name,verified,public_metrics'
-            }
+            params = dict(_BASE_PARAMS)
+            params['query'] = query
+            params['max_results'] = min(max_results, 100)  # Twitter API limit
 
             if since_id:
                 params['since_id'] = since_id
 
-            logger.debug(f"🔍 Searching Twitter for hashtags: {hashtags}")
-            logger.debug(f"🔍 Query: {query}")
+            logger.debug("🔍 Query: %s", query)
 
             url = f"{self.base_url}/tweets/search/recent"
-            response = self.session.get(url, params=params)
+            token = self._next_token()
+            response = self.session.get(url, params=params, headers={'Authorization': f'Bearer {token}'})
+            self._record_rate_limit(response, token)
 
-            if response.status_code == 200:
-                data = response.json()
-                tweets = data.get('data', [])
-                users = {user['id']: user for user in data.get('includes', {}).get('users', [])}
-
-                # Process tweets and add user information
-                processed_tweets = []
-                for tweet in tweets:
-                    user_info = users.get(tweet['author_id'], {})
-
-                    processed_tweet = {
-                        'tweet_id': tweet['id'],
-                        'text': tweet['text'],
-                        'author_id': tweet['author_id'],
-                        'author_username': user_info.get('username', 'unknown'),
-                        'author_name': user_info.get('name', 'Unknown User'),
-                        'author_verified': user_info.get('verified', False),
-                        'created_at': tweet['created_at'],
-                        'lang': tweet.get('lang', 'und'),
-                        'retweet_count': tweet.get('public_metrics', {}).get('retweet_count', 0),
-                        'like_count': tweet.get('public_metrics', {}).get('like_count', 0),
-                        'reply_count': tweet.get('public_metrics', {}).get('reply_count', 0),
-                        'quote_count': tweet.get('public_metrics', {}).get('quote_count', 0),
-                        'conversation_id': tweet.get('conversation_id', ''),
-                        'in_reply_to_user_id': tweet.get('in_reply_to_user_id', ''),
-                        'referenced_tweets': tweet.get('referenced_tweets', []),
-                        'hashtags': self._extract_hashtags(tweet['text'])
-                    }
-                    processed_tweets.append(processed_tweet)
-
-                logger.info(f"✅ Retrieved {len(processed_tweets)} tweets for hashtags: {hashtags}")
-                return processed_tweets
-
-            elif response.status_code == 429:
-                logger.warning("⚠️ X API rate limit exceeded")
-                # Extract rate limit info from headers if available
-                reset_time = response.headers.get('x-rate-limit-reset', 'unknown')
-                remaining = response.headers.get('x-rate-limit-remaining', 'unknown')
-
-                if reset_time != 'unknown':
-                    try:
-                        import datetime
-                        reset_readable = datetime.datetime.fromtimestamp(int(reset_time)).strftime('%H:%M:%S UTC')
-                        logger.info(f"🕒 Rate limit resets at: {reset_readable}")
-                    except:
-                        pass
-
-                logger.info(f"⏳ Remaining requests: {remaining}")
-                logger.info("💡 Consider increasing TWITTER_POLL_INTERVAL to avoid rate limits")
-                return []
-            elif response.status_code == 401:
-                logger.error("❌ Twitter API authentication failed")
-                return []
-            else:
-                logger.error(f"❌ Twitter API search failed: {response.status_code} - {response.text}")
-                return []
+            handler = self._search_handlers.get(response.status_code, self._on_search_failed)
+            return handler(response, query)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Network error searching Twitter hashtags: {e}")
+            logger.error("❌ Network error searching Twitter hashtags: %s", e)
             return []
         except Exception as e:
-            logger.error(f"❌ Unexpected error searching Twitter hashtags: {e}")
+            logger.error("❌ Unexpected error searching Twitter hashtags: %s", e)
             return []
 
+    def _on_search_ok(self, response: requests.Response, query: str) -> List[ProcessedTweet]:
+        """Process the tweets of a successful search response."""
+        data = orjson.loads(response.content)
+        tweets = data.get('data', [])
+        users = {user['id']: user for user in data.get('includes', {}).get('users', [])}
+
+        # Process tweets and add user information
+        processed_tweets = [
+            self._process_tweet(tweet, users.get(tweet['author_id'], _EMPTY_USER))
+            for tweet in tweets
+        ]
+
+        logger.info("✅ Retrieved %s tweets for query: %s", len(processed_tweets), query)
+        return processed_tweets
+
+    def _on_search_rate_limited(self, response: requests.Response, query: str) -> List[ProcessedTweet]:
+        """Log when the rate limit resets after a 429 response."""
+        logger.warning("⚠️ X API rate limit exceeded")
+        # Extract rate limit info from headers if available
+        reset_time = response.headers.get('x-rate-limit-reset', 'unknown')
+        remaining = response.headers.get('x-rate-limit-remaining', 'unknown')
+
+        if reset_time != 'unknown':
+            try:
+                reset_readable = datetime.fromtimestamp(int(reset_time)).strftime('%H:%M:%S UTC')
+                logger.info("🕒 Rate limit resets at: %s", reset_readable)
+            except:
+                pass
+
+        logger.info("⏳ Remaining requests: %s", remaining)
+        logger.info("💡 Consider increasing TWITTER_POLL_INTERVAL to avoid rate limits")
+        return []
+
+    def _on_search_unauthorized(self, response: requests.Response, query: str) -> List[ProcessedTweet]:
+        """Log a 401 search response."""
+        logger.error("❌ Twitter API authentication failed")
+        return []
+
+    def _on_search_failed(self, response: requests.Response, query: str) -> List[ProcessedTweet]:
+        """Log any other unsuccessful search response."""
+        logger.error("❌ Twitter API search failed: %s - %s", response.status_code, response.text)
+        return []
+
+    def _process_tweet(self, tweet: Dict[str, Any], user_info: Dict[str, Any]) -> ProcessedTweet:
+        """Flatten one search result and its author into a processed tweet."""
+        get = tweet.get
+        metrics = get('public_metrics') or _EMPTY
+        created_at = tweet['created_at']
+        return ProcessedTweet(
+            tweet_id=tweet['id'],
+            text=tweet['text'],
+            author_id=tweet['author_id'],
+            # username and name are always returned for an expanded user
+            author_username=user_info['username'],
+            author_name=user_info['name'],
+            author_verified=user_info.get('verified', False),
+            created_at=created_at,
+            created_utc=self._convert_twitter_timestamp(created_at),
+            lang=get('lang', 'und'),
+            retweet_count=metrics.get('retweet_count', 0),
+            like_count=metrics.get('like_count', 0),
+            reply_count=metrics.get('reply_count', 0),
+            quote_count=metrics.get('quote_count', 0),
+            conversation_id=get('conversation_id', ''),
+            in_reply_to_user_id=get('in_reply_to_user_id', ''),
+            referenced_tweets=get('referenced_tweets', []),
+            hashtags=self._extract_hashtags(tweet['text'])
+        )
+
     def _extract_hashtags(self, text: str) -> List[str]:
         """Extract hashtags from tweet text."""
-        import re
-        hashtag_pattern = r'#(\w+)'
-        hashtags = re.findall(hashtag_pattern, text.lower())
-        return hashtags
+        # Lowercase only the matched tags rather than copying the whole text
+        return [hashtag.lower() for hashtag in _HASHTAG_RE.findall(text)]
 
     def _convert_twitter_timestamp(self, twitter_timestamp: str) -> int:
         """Convert Twitter's ISO timestamp to Unix timestamp."""
         try:
-            # Twitter returns timestamps like: 2023-01-01T12:00:00.000Z
-            dt = datetime.fromisoformat(twitter_timestamp.replace('Z', '+00:00'))
-            return int(dt.timestamp())
-        except (ValueError, AttributeError) as e:
-            logger.error(f"❌ Failed to parse Twitter timestamp '{twitter_timestamp}': {e}")
+            return iso_to_unix(twitter_timestamp)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.error("❌ Failed to parse Twitter timestamp '%s': %s", twitter_timestamp, e)
             return int(time.time())  # Fallback to current time
 
-    def get_rate_limit_status(self) -> Dict[str, Any]:
-        """Get current rate limit status for search endpoint."""
+    def get_rate_limit_status(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Get current rate limit status for search endpoint.
+
+        Reports the primary bearer token; with several tokens in rotation the
+        remaining requests of each are logged as well.
+
+        Args:
+            force: Always query the API instead of reusing headers seen in the last
+                RATE_LIMIT_CACHE_SECONDS (each query spends one search request)
+
+        Returns:
+            Rate limit info dictionary, or an empty dict on failure
+        """
+        with self._token_lock:
+            rate_limit_info = self._rate_limits.get(self.bearer_token)
+            checked_at = self._rate_limit_checked_at.get(self.bearer_token)
+            other_tokens = [(position, self._rate_limits.get(token))
+                            for position, token in enumerate(self._bearer_tokens, 1) if token != self.bearer_token]
+
+        if force or checked_at is None or time.monotonic() - checked_at >= RATE_LIMIT_CACHE_SECONDS:
+            try:
+                url = f"{self.base_url}/tweets/search/recent"
+                response = self.session.get(url, params={'query': 'test', 'max_results': 10})
+                rate_limit_info = self._record_rate_limit(response, self.bearer_token)
+            except Exception as e:
+                logger.error("❌ Failed to get rate limit status: %s", e)
+                return {}
+
+        logger.info("🔍 X API Rate Limit Status:")
+        logger.info("   📊 Limit: %s", rate_limit_info['limit'])
+        logger.info("   ⚡ Remaining: %s", rate_limit_info['remaining'])
+        logger.info("   🕒 Reset: %s", rate_limit_info.get('reset_readable', rate_limit_info['reset']))
+        for position, info in other_tokens:
+            logger.info("   🔁 Token %s/%s remaining: %s", position, len(self._bearer_tokens),
+                        info['remaining'] if info else 'unknown')
+
+        return dict(rate_limit_info)
+
+    def next_poll_delay(self, min_interval: float) -> float:
+        """
+        Seconds to wait before the next poll so the remaining requests last the window.
+
+        Adds up the requests left on every bearer token that is not waiting for
+        its reset, paced over the latest of their reset times. Only when every
+        token is exhausted does it wait for the first one to reset.
+
+        Args:
+            min_interval: Configured poll interval, returned when it is already slow enough
+
+        Returns:
+            The larger of min_interval and the evenly paced delay
+        """
+        now = time.time()
+        with self._token_lock:
+            available = [self._rate_limits.get(token) for token in self._bearer_tokens
+                         if self._token_reset_at.get(token, 0) <= now]
+            waiting_until = [self._token_reset_at[token] for token in self._bearer_tokens
+                             if self._token_reset_at.get(token, 0) > now]
+
+        if not available:
+            return max(min_interval, min(waiting_until) - now)
+
         try:
-            url = f"{self.base_url}/tweets/search/recent"
-            response = self.session.get(url, params={'query': 'test', 'max_results': 10})
-
-            rate_limit_info = {
-                'limit': response.headers.get('x-rate-limit-limit', 'unknown'),
-                'remaining': response.headers.get('x-rate-limit-remaining', 'unknown'),
-                'reset': response.headers.get('x-rate-limit-reset', 'unknown'),
-                'status_code': response.status_code
-            }
-
-            # Convert reset timestamp to readable format
-            if rate_limit_info['reset'] != 'unknown':
-                try:
-                    import datetime
-                    reset_time = datetime.datetime.fromtimestamp(int(rate_limit_info['reset']))
-                    rate_limit_info['reset_readable'] = reset_time.strftime('%Y-%m-%d %H:%M:%S UTC')
-                except:
-                    rate_limit_info['reset_readable'] = 'unknown'
-
-            logger.info(f"🔍 X API Rate Limit Status:")
-            logger.info(f"   📊 Limit: {rate_limit_info['limit']}")
-            logger.info(f"   ⚡ Remaining: {rate_limit_info['remaining']}")
-            logger.info(f"   🕒 Reset: {rate_limit_info.get('reset_readable', rate_limit_info['reset'])}")
-
-            return rate_limit_info
+            remaining = sum(int(info['remaining']) for info in available)
+            reset = max(int(info['reset']) for info in available)
+        except (TypeError, KeyError, ValueError):
+            # A token has not reported its headers yet
+            return min_interval
+
+        polls_left = remaining // self._requests_per_poll
+        return max(min_interval, (reset - now) / max(1, polls_left - 1))
+
+    def _next_token(self) -> str:
+        """Pick the next bearer token in rotation that is not waiting for its rate limit reset."""
+        now = time.time()
+        with self._token_lock:
+            for _ in range(len(self._bearer_tokens)):
+                token = next(self._token_cycle)
+                if self._token_reset_at.get(token, 0) <= now:
+                    return token
+            # Every token is exhausted; use the one that resets first
+            return min(self._bearer_tokens, key=lambda token: self._token_reset_at[token])
+
+    def _record_rate_limit(self, response: requests.Response, token: Optional[str] = None) -> Dict[str, Any]:
+        """Parse and remember the rate limit headers of a search response made with token (default bearer_token)."""
+        token = token or self.bearer_token
+        rate_limit_info = {
+            'limit': response.headers.get('x-rate-limit-limit', 'unknown'),
+            'remaining': response.headers.get('x-rate-limit-remaining', 'unknown'),
+            'reset': response.headers.get('x-rate-limit-reset', 'unknown'),
+            'status_code': response.status_code
+        }
+
+        # Convert reset timestamp to readable format
+        if rate_limit_info['reset'] != 'unknown':
+            try:
+                reset_time = datetime.fromtimestamp(int(rate_limit_info['reset']))
+                rate_limit_info['reset_readable'] = reset_time.strftime('%Y-%m-%d %H:%M:%S UTC')
+            except:
+                rate_limit_info['reset_readable'] = 'unknown'
+
+        # Skip a token with no requests left until its window resets
+        exhausted = response.status_code == 429 or rate_limit_info['remaining'] == '0'
+        if exhausted:
+            try:
+                reset_at = int(rate_limit_info['reset'])
+            except ValueError:
+                reset_at = int(time.time()) + RATE_LIMIT_WINDOW_SECONDS
+
+        with self._token_lock:
+            self._rate_limits[token] = rate_limit_info
+            self._rate_limit_checked_at[token] = time.monotonic()
+            if exhausted:
+                self._token_reset_at[token] = reset_at
+            else:
+                self._token_reset_at.pop(token, None)
 
-        except Exception as e:
-            logger.error(f"❌ Failed to get rate limit status: {e}")
-            return {}
\ No newline at end of file
+        if exhausted and len(self._bearer_tokens) > 1 and token in self._bearer_tokens:
+            logger.info("🔁 Bearer token %s/%s exhausted, rotating to the next one",
+                        self._bearer_tokens.index(token) + 1, len(self._bearer_tokens))
+        return rate_limit_info
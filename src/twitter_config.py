@@ -7,6 +7,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from dotenv import load_dotenv
+
 from .twitter_models import TwitterConfig
 
 
@@ -20,7 +22,7 @@ def setup_twitter_signal_handlers():
     """Set up signal handlers for graceful shutdown."""
     def signal_handler(signum, frame):
         global shutdown_requested
-        logger.info(f"Received signal {signum}, initiating graceful shutdown...")
+        logger.info("Received signal %s, initiating graceful shutdown...", signum)
         shutdown_requested = True
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -34,7 +36,7 @@ def load_twitter_config() -> TwitterConfig:
         logger.info("✅ Twitter configuration loaded successfully")
         return config
     except Exception as e:
-        logger.error(f"❌ Failed to load Twitter configuration: {e}")
+        logger.error("❌ Failed to load Twitter configuration: %s", e)
         raise
 
 
@@ -43,6 +45,8 @@ def create_twitter_env_template(file_path: str = ".env.twitter"):
     template_content = """# Twitter API Configuration
 # Get your Bearer Token from: https://developer.twitter.com/en/portal/dashboard
 TWITTER_BEARER_TOKEN=your_bearer_token_here
+# Optional: more tokens (comma-separated) to rotate between when one hits its rate limit
+# TWITTER_BEARER_TOKENS=token_one,token_two
 
 # Hashtags to monitor (comma-separated, without # symbol)
 TWITTER_HASHTAGS=samsung,technology,mobile
@@ -68,12 +72,12 @@ LOG_LEVEL=INFO
     try:
         with open(file_path, 'w') as f:
             f.write(template_content)
-        logger.info(f"✅ Twitter environment template created: {file_path}")
+        logger.info("✅ Twitter environment template created: %s", file_path)
         print(f"📄 Twitter environment template created: {file_path}")
         print("📝 Please edit the file and add your Twitter Bearer Token")
         return True
     except Exception as e:
-        logger.error(f"❌ Failed to create Twitter environment template: {e}")
+        logger.error("❌ Failed to create Twitter environment template: %s", e)
         return False
 
 
@@ -86,8 +90,12 @@ def validate_twitter_environment() -> bool:
         if not os.getenv(var):
             missing_vars.append(var)
 
+    # A token pool can stand in for the single token
+    if os.getenv('TWITTER_BEARER_TOKENS', '').strip(','):
+        missing_vars = [var for var in missing_vars if var != 'TWITTER_BEARER_TOKEN']
+
     if missing_vars:
-        logger.error(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+        logger.error("❌ Missing required environment variables: %s", ', '.join(missing_vars))
         print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
         print("💡 Run with --create-env to create a template .env.twitter file")
         return False
@@ -124,27 +132,23 @@ def setup_twitter_logging(log_level: str = "INFO"):
     root_logger.addHandler(file_handler)
     root_logger.addHandler(console_handler)
 
-    logger.info(f"📋 Twitter logging configured - Level: {log_level}")
+    logger.info("📋 Twitter logging configured - Level: %s", log_level)
 
 
 def load_env_file(env_file: str = ".env.twitter"):
     """Load environment variables from a file."""
     if not os.path.exists(env_file):
-        logger.warning(f"⚠️ Environment file {env_file} not found")
+        logger.warning("⚠️ Environment file %s not found", env_file)
         return False
 
     try:
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
-
-        logger.info(f"✅ Environment variables loaded from {env_file}")
+        # Variables already set in the environment take precedence, as in load_environment()
+        load_dotenv(env_file)
+
+        logger.info("✅ Environment variables loaded from %s", env_file)
         return True
     except Exception as e:
-        logger.error(f"❌ Failed to load environment file {env_file}: {e}")
+        logger.error("❌ Failed to load environment file %s: %s", env_file, e)
         return False
 
 
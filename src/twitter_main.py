@@ -33,6 +33,7 @@ Examples:
 
 Environment Variables:
   TWITTER_BEARER_TOKEN     Twitter API Bearer Token (required)
+  TWITTER_BEARER_TOKENS    Comma-separated tokens to rotate between (optional)
   TWITTER_HASHTAGS         Comma-separated hashtags (default: samsung,technology)
   TWITTER_POLL_INTERVAL    Polling interval in seconds (min: 120)
   TWITTER_MAX_RESULTS      Max tweets per request (10-100, default: 100)
@@ -91,13 +92,14 @@ Environment Variables:
             print("❌ Environment validation failed")
             return 1
 
+        client = None
         try:
             from .twitter_client import TwitterClient
             config = load_twitter_config()
             client = TwitterClient(config.bearer_token, config.user_agent)
 
             print("🔍 Checking current X API rate limit usage...")
-            rate_info = client.get_rate_limit_status()
+            rate_info = client.get_rate_limit_status(force=True)
 
             if rate_info:
                 print(f"\n📊 X API Rate Limit Status:")
@@ -131,6 +133,9 @@ Environment Variables:
         except Exception as e:
             print(f"❌ Failed to check usage: {e}")
             return 1
+        finally:
+            if client:
+                client.close()
 
     # Load environment file if it exists
     if os.path.exists(args.env):
@@ -169,29 +174,36 @@ Environment Variables:
             print("🧪 Running Twitter hashtag monitoring test cycle...")
             print(f"🏷️ Monitoring hashtags: {', '.join([f'#{tag}' for tag in config.hashtags])}")
 
-            # Initialize monitor for test
-            if not monitor.initialize():
-                print("❌ Failed to initialize Twitter monitor")
-                return 1
-
-            # Run single cycle
-            new_tweets = monitor.run_once()
-
-            if new_tweets >= 0:
-                print(f"✅ Test completed successfully. New tweets stored: {new_tweets}")
-
-                # Show some stats
-                stats = monitor.get_stats()
-                print(f"📊 Total tweets fetched: {stats.total_tweets_fetched}")
-                print(f"💾 New tweets saved: {stats.new_tweets_saved}")
-
-                if stats.errors_count > 0:
-                    print(f"⚠️ Errors encountered: {stats.errors_count}")
-
-                return 0
-            else:
-                print("❌ Test cycle failed")
-                return 1
+            try:
+                # Initialize monitor for test
+                if not monitor.initialize():
+                    print("❌ Failed to initialize Twitter monitor")
+                    return 1
+
+                # Run single cycle
+                new_tweets = monitor.run_once()
+
+                if new_tweets >= 0:
+                    print(f"✅ Test completed successfully. New tweets stored: {new_tweets}")
+
+                    # Show some stats
+                    stats = monitor.get_stats()
+                    print(f"📊 Total tweets fetched: {stats.total_tweets_fetched}")
+                    print(f"💾 New tweets saved: {stats.new_tweets_saved}")
+
+                    if stats.errors_count > 0:
+                        print(f"⚠️ Errors encountered: {stats.errors_count}")
+
+                    return 0
+                else:
+                    print("❌ Test cycle failed")
+                    return 1
+            finally:
+                # run() cleans up after itself; a single test cycle has to do it here
+                if monitor.client:
+                    monitor.client.close()
+                if monitor.database:
+                    monitor.database.disconnect()
         else:
             print("🚀 Starting Twitter hashtag monitoring...")
             print(f"🏷️ Monitoring hashtags: {', '.join([f'#{tag}' for tag in config.hashtags])}")
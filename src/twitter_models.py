@@ -1,13 +1,31 @@
 """Data models for Twitter tweets and monitoring."""
 
-from pydantic import BaseModel, Field
+import orjson
+import time
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
+@lru_cache(maxsize=4096)
+def iso_to_unix(timestamp: str) -> int:
+    """Convert an X ISO timestamp to a Unix timestamp; tweets in a burst often share one."""
+    try:
+        # X returns timestamps like: 2023-01-01T12:00:00.000Z, which
+        # fromisoformat parses directly on Python 3.11+ without copying the string
+        return int(datetime.fromisoformat(timestamp).timestamp())
+    except ValueError:
+        return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp())
+
+
 class TwitterTweet(BaseModel):
     """Twitter tweet data model."""
 
+    # Tweets are never modified after construction; unknown keys from the API are dropped
+    model_config = ConfigDict(frozen=True, extra='ignore', validate_assignment=False)
+
     tweet_id: str = Field(..., description="Unique Twitter tweet ID")
     text: str = Field(..., description="Tweet text content")
     author_id: str = Field(..., description="Twitter user ID of the author")
@@ -28,33 +46,32 @@ class TwitterTweet(BaseModel):
 
     def to_dict(self) -> dict:
         """Convert model to dictionary for database insertion."""
-        return {
-            'tweet_id': self.tweet_id,
-            'text': self.text,
-            'author_id': self.author_id,
-            'author_username': self.author_username,
-            'author_name': self.author_name,
-            'author_verified': self.author_verified,
-            'created_at': self.created_at,
-            'created_utc': self.created_utc,
-            'lang': self.lang,
-            'retweet_count': self.retweet_count,
-            'like_count': self.like_count,
-            'reply_count': self.reply_count,
-            'quote_count': self.quote_count,
-            'conversation_id': self.conversation_id,
-            'in_reply_to_user_id': self.in_reply_to_user_id,
-            'hashtags': ','.join(self.hashtags),  # Store as comma-separated string
-            'referenced_tweets': str(self.referenced_tweets) if self.referenced_tweets else ''
-        }
+        # Field values live in __dict__; copy it rather than reading each attribute
+        data = dict(self.__dict__)
+        data['hashtags'] = list(self.hashtags)  # Stored as a TEXT[] column
+        data['referenced_tweets'] = orjson.dumps(self.referenced_tweets).decode() if self.referenced_tweets else ''
+        return data
 
     @classmethod
-    def from_twitter_data(cls, data: dict) -> 'TwitterTweet':
-        """Create TwitterTweet from processed Twitter API data."""
+    def from_twitter_data(cls, data: dict, validate: bool = False) -> 'TwitterTweet':
+        """
+        Create TwitterTweet from processed Twitter API data.
+
+        TwitterClient output already has every field in its final type, so
+        validation is skipped unless requested.
+
+        Args:
+            data: Tweet data as produced by TwitterClient
+            validate: Run full Pydantic validation (useful when developing against new data)
+
+        Returns:
+            TwitterTweet instance
+        """
         # Convert Twitter timestamp to Unix timestamp
         created_utc = cls._convert_twitter_timestamp(data.get('created_at', ''))
 
-        return cls(
+        build = cls if validate else cls.model_construct
+        return build(
             tweet_id=data.get('tweet_id', ''),
             text=data.get('text', ''),
             author_id=data.get('author_id', ''),
@@ -74,14 +91,17 @@ class TwitterTweet(BaseModel):
             referenced_tweets=data.get('referenced_tweets', [])
         )
 
+    @classmethod
+    def from_raw_json(cls, raw: bytes) -> 'TwitterTweet':
+        """Create TwitterTweet without validation from a JSON-encoded processed tweet."""
+        return cls.from_twitter_data(orjson.loads(raw))
+
     @staticmethod
     def _convert_twitter_timestamp(twitter_timestamp: str) -> int:
         """Convert Twitter's ISO timestamp to Unix timestamp."""
         try:
-            # Twitter returns timestamps like: 2023-01-01T12:00:00.000Z
-            dt = datetime.fromisoformat(twitter_timestamp.replace('Z', '+00:00'))
-            return int(dt.timestamp())
-        except (ValueError, AttributeError):
+            return iso_to_unix(twitter_timestamp)
+        except (ValueError, TypeError, AttributeError):
             return int(datetime.now().timestamp())  # Fallback to current time
 
     def __str__(self) -> str:
@@ -91,6 +111,65 @@ class TwitterTweet(BaseModel):
         return self.__str__()
 
 
+@dataclass(slots=True, frozen=True)
+class ProcessedTweet:
+    """Unvalidated tweet record produced by TwitterClient; same fields as TwitterTweet."""
+
+    tweet_id: str
+    text: str
+    author_id: str
+    created_at: str
+    created_utc: int
+    author_username: str = "unknown"
+    author_name: str = "Unknown User"
+    author_verified: bool = False
+    lang: str = "und"
+    retweet_count: int = 0
+    like_count: int = 0
+    reply_count: int = 0
+    quote_count: int = 0
+    conversation_id: str = ""
+    in_reply_to_user_id: str = ""
+    hashtags: List[str] = field(default_factory=list)
+    referenced_tweets: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert record to dictionary for database insertion."""
+        return {
+            'tweet_id': self.tweet_id,
+            'text': self.text,
+            'author_id': self.author_id,
+            'author_username': self.author_username,
+            'author_name': self.author_name,
+            'author_verified': self.author_verified,
+            'created_at': self.created_at,
+            'created_utc': self.created_utc,
+            'lang': self.lang,
+            'retweet_count': self.retweet_count,
+            'like_count': self.like_count,
+            'reply_count': self.reply_count,
+            'quote_count': self.quote_count,
+            'conversation_id': self.conversation_id,
+            'in_reply_to_user_id': self.in_reply_to_user_id,
+            'hashtags': self.hashtags,  # Stored as a TEXT[] column
+            'referenced_tweets': orjson.dumps(self.referenced_tweets).decode() if self.referenced_tweets else ''
+        }
+
+    def to_row(self) -> tuple:
+        """Convert record straight to an insert row in database.TWEET_COLUMNS order."""
+        return (
+            self.tweet_id, self.text, self.author_id, self.author_username, self.author_name,
+            self.author_verified, self.created_at, self.created_utc, self.lang, self.retweet_count,
+            self.like_count, self.reply_count, self.quote_count, self.conversation_id,
+            self.in_reply_to_user_id, self.hashtags,
+            orjson.dumps(self.referenced_tweets).decode() if self.referenced_tweets else ''
+        )
+
+    def to_pydantic(self) -> TwitterTweet:
+        """Convert to a validated TwitterTweet."""
+        return TwitterTweet(**asdict(self))
+
+
 class TwitterMonitorStats(BaseModel):
     """Statistics for the Twitter monitoring session."""
 
@@ -103,6 +182,9 @@ class TwitterMonitorStats(BaseModel):
     hashtags_monitored: List[str] = Field(default=[], description="List of hashtags being monitored")
     rate_limit_hits: int = Field(default=0, description="Number of times rate limit was hit")
 
+    # time.monotonic() at session start; runtime is measured from this, start_time is for display
+    _start_monotonic: float = PrivateAttr(default_factory=time.monotonic)
+
     def add_fetch_result(self, tweets_fetched: int, new_tweets: int):
         """Update stats after a fetch operation."""
         self.total_tweets_fetched += tweets_fetched
@@ -119,7 +201,7 @@ class TwitterMonitorStats(BaseModel):
 
     def get_runtime_seconds(self) -> int:
         """Get total runtime in seconds."""
-        return int((datetime.now() - self.start_time).total_seconds())
+        return int(time.monotonic() - self._start_monotonic)
 
     def get_tweets_per_minute(self) -> float:
         """Calculate tweets per minute rate."""
@@ -139,8 +221,12 @@ class TwitterMonitorStats(BaseModel):
 class TwitterConfig(BaseModel):
     """Twitter monitoring configuration model."""
 
+    # Immutable, so the instance cached by from_env() can be shared safely
+    model_config = ConfigDict(frozen=True)
+
     # Twitter API configuration
     bearer_token: str = Field(..., description="Twitter API Bearer token")
+    bearer_tokens: List[str] = Field(default=[], description="Bearer tokens to rotate between for search requests")
     user_agent: str = Field(default="XHashtagMonitor/1.0", description="User agent for requests")
 
     # Database configuration
@@ -159,20 +245,27 @@ class TwitterConfig(BaseModel):
     log_level: str = Field(default="INFO", description="Logging level")
 
     @classmethod
+    @lru_cache(maxsize=None)
     def from_env(cls) -> 'TwitterConfig':
-        """Create config from environment variables."""
+        """Create config from environment variables (parsed once per process)."""
         import os
 
         # Parse hashtags from environment variable (comma-separated)
         hashtags_env = os.getenv('TWITTER_HASHTAGS', 'samsung,technology')
         hashtags = [tag.strip().lstrip('#') for tag in hashtags_env.split(',') if tag.strip()]
 
-        bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
+        # Optional pool of tokens (comma-separated); each has its own search rate limit
+        bearer_tokens = [token.strip() for token in os.getenv('TWITTER_BEARER_TOKENS', '').split(',') if token.strip()]
+
+        bearer_token = os.getenv('TWITTER_BEARER_TOKEN') or (bearer_tokens[0] if bearer_tokens else None)
         if not bearer_token:
             raise ValueError("TWITTER_BEARER_TOKEN environment variable is required")
+        if bearer_token not in bearer_tokens:
+            bearer_tokens.insert(0, bearer_token)
 
         return cls(
             bearer_token=bearer_token,
+            bearer_tokens=bearer_tokens,
             user_agent=os.getenv('TWITTER_USER_AGENT', 'XHashtagMonitor/1.0'),
 
             db_host=os.getenv('DB_HOST', 'localhost'),
@@ -4,16 +4,43 @@ import logging
 import time
 import signal
 import sys
+import threading
+import weakref
 from typing import List, Optional
 from datetime import datetime
 
 from .twitter_client import TwitterClient
-from .twitter_models import TwitterTweet, TwitterMonitorStats, TwitterConfig
+from .twitter_models import TwitterMonitorStats, TwitterConfig
 from .database import Database
+from .recent_ids import RecentIds
 
 
 logger = logging.getLogger(__name__)
 
+# Seconds between periodic statistics blocks in the monitoring loop
+STATS_LOG_INTERVAL = 300
+
+# Monitors stopped by SIGINT/SIGTERM; the handlers are installed once per process
+_active_monitors: "weakref.WeakSet[TwitterMonitor]" = weakref.WeakSet()
+_signals_installed = False
+
+
+def _handle_shutdown_signal(signum, frame):
+    """Stop every live monitor on SIGINT/SIGTERM."""
+    logger.info("Received signal %s, shutting down gracefully...", signum)
+    for monitor in list(_active_monitors):
+        monitor.running = False
+
+
+def _install_signal_handlers() -> None:
+    """Install the shutdown handlers once, from the main thread only (signal.signal raises elsewhere)."""
+    global _signals_installed
+    if _signals_installed or threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(signal.SIGINT, _handle_shutdown_signal)
+    signal.signal(signal.SIGTERM, _handle_shutdown_signal)
+    _signals_installed = True
+
 
 class TwitterMonitor:
     """Twitter hashtag monitoring service."""
@@ -26,15 +53,14 @@ class TwitterMonitor:
         self.database: Optional[Database] = None
         self.running = False
         self._skip_connection_test = False  # Can be set to skip API test
+        # Tweet IDs stored this session, so re-served tweets are dropped before reaching the database
+        self.recent_tweet_ids = RecentIds(maxlen=10_000)
+        # time.monotonic() deadline for the next periodic statistics block
+        self._next_stats_at = 0.0
 
         # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals gracefully."""
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
-        self.running = False
+        _active_monitors.add(self)
+        _install_signal_handlers()
 
     def initialize(self) -> bool:
         """Initialize all components."""
@@ -66,11 +92,15 @@ class TwitterMonitor:
                 logger.error("❌ Failed to create Twitter tables")
                 return False
 
+            # Seed since_id once from the database; each cycle advances it in memory
+            self.stats.last_tweet_id = self.database.get_latest_tweet_id()
+
             # Initialize Twitter client
             logger.info("🐦 Initializing Twitter API client...")
             self.client = TwitterClient(
                 bearer_token=self.config.bearer_token,
-                user_agent=self.config.user_agent
+                user_agent=self.config.user_agent,
+                bearer_tokens=self.config.bearer_tokens
             )
 
             # Test Twitter API connection (skip if requested to conserve rate limits)
@@ -90,17 +120,27 @@ class TwitterMonitor:
             return False
 
     def _setup_logging(self):
-        """Set up logging configuration."""
+        """Set up logging configuration, unless twitter_monitor.log is already being written."""
         import os
         from pathlib import Path
 
-        # Create logs directory if it doesn't exist
         log_dir = Path("logs")
+        log_file = os.path.abspath(log_dir / "twitter_monitor.log")
+        log_level = getattr(logging, self.config.log_level.upper(), logging.INFO)
+        root_logger = logging.getLogger()
+
+        # setup_twitter_logging() or an earlier initialize() already attached the handlers;
+        # adding them again would write every record twice
+        if any(isinstance(handler, logging.FileHandler) and handler.baseFilename == log_file
+               for handler in root_logger.handlers):
+            root_logger.setLevel(log_level)
+            return
+
+        # Create logs directory if it doesn't exist
         log_dir.mkdir(exist_ok=True)
 
         # Configure logging
         log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        log_level = getattr(logging, self.config.log_level.upper(), logging.INFO)
 
         # File handler
         file_handler = logging.FileHandler(log_dir / "twitter_monitor.log")
@@ -111,7 +151,6 @@ class TwitterMonitor:
         console_handler.setFormatter(logging.Formatter(log_format))
 
         # Root logger configuration
-        root_logger = logging.getLogger()
         root_logger.setLevel(log_level)
         root_logger.addHandler(file_handler)
         root_logger.addHandler(console_handler)
@@ -123,8 +162,8 @@ class TwitterMonitor:
         try:
             logger.info("🚀 Starting single Twitter monitoring cycle...")
 
-            # Get the latest tweet ID from database for incremental fetching
-            since_id = self.database.get_latest_tweet_id()
+            # Only ask for tweets newer than the highest ID stored so far
+            since_id = self.stats.last_tweet_id
             if since_id:
                 logger.info(f"🔍 Fetching tweets since ID: {since_id}")
             else:
@@ -141,23 +180,25 @@ class TwitterMonitor:
                 logger.info("📭 No new tweets found")
                 return 0
 
-            logger.info(f"📥 Processing {len(tweets)} tweets...")
+            fresh_tweets = [tweet for tweet in tweets if tweet.tweet_id not in self.recent_tweet_ids]
+            if len(fresh_tweets) < len(tweets):
+                logger.info("🔍 Skipping %s tweets already stored this session", len(tweets) - len(fresh_tweets))
 
-            # Convert and store tweets
-            new_tweets_count = 0
-            for tweet_data in tweets:
-                try:
-                    # Create TwitterTweet model
-                    tweet = TwitterTweet.from_twitter_data(tweet_data)
+            logger.info(f"📥 Processing {len(fresh_tweets)} tweets...")
 
-                    # Insert into database
-                    if self.database.insert_tweet(tweet.to_dict()):
-                        new_tweets_count += 1
-                        self.stats.last_tweet_id = tweet.tweet_id
+            # TwitterClient already produced slotted records in the final schema; no intermediate dicts
+            tweet_rows = [tweet.to_row() for tweet in fresh_tweets]
 
-                except Exception as e:
-                    logger.error(f"❌ Error processing tweet: {e}")
-                    self.stats.add_error()
+            # Insert the whole cycle in one batch
+            inserted_ids = self.database.insert_tweets_batch(tweet_rows)
+            new_tweets_count = len(inserted_ids)
+            for tweet_id in inserted_ids:
+                self.recent_tweet_ids.add(tweet_id)
+            if inserted_ids:
+                # RETURNING order is not ID order; compare numerically as IDs vary in length
+                newest_id = max(inserted_ids, key=int)
+                if since_id is None or int(newest_id) > int(since_id):
+                    self.stats.last_tweet_id = newest_id
 
             # Update statistics
             self.stats.add_fetch_result(len(tweets), new_tweets_count)
@@ -186,8 +227,9 @@ class TwitterMonitor:
         logger.info(f"   📊 Max results per fetch: {self.config.max_results}")
 
         try:
+            self._next_stats_at = time.monotonic() + STATS_LOG_INTERVAL
             while self.running:
-                cycle_start = time.time()
+                cycle_start = time.monotonic()
 
                 # Run monitoring cycle
                 new_tweets = self.run_once()
@@ -196,19 +238,26 @@ class TwitterMonitor:
                     logger.error("❌ Monitoring cycle failed, continuing...")
 
                 # Log statistics every 5 minutes
-                if self.stats.get_runtime_seconds() % 300 < self.config.poll_interval:
+                now = time.monotonic()
+                if now >= self._next_stats_at:
+                    self._next_stats_at = now + STATS_LOG_INTERVAL
                     self._log_statistics()
 
+                # Stretch the interval when the remaining rate limit would run out before it resets
+                poll_interval = self.client.next_poll_delay(self.config.poll_interval)
+                if poll_interval > self.config.poll_interval:
+                    logger.info("⏱️ Pacing polls to every %.0fs to stay within the rate limit", poll_interval)
+
                 # Calculate sleep time to maintain polling interval
-                cycle_duration = time.time() - cycle_start
-                sleep_time = max(0, self.config.poll_interval - cycle_duration)
+                cycle_duration = time.monotonic() - cycle_start
+                sleep_time = max(0, poll_interval - cycle_duration)
 
                 if sleep_time > 0:
                     logger.debug(f"💤 Sleeping for {sleep_time:.1f}s...")
                     time.sleep(sleep_time)
                 else:
                     logger.warning(f"⚠️ Cycle took {cycle_duration:.1f}s, "
-                                 f"longer than poll interval ({self.config.poll_interval}s)")
+                                 f"longer than poll interval ({poll_interval:.0f}s)")
 
         except KeyboardInterrupt:
             logger.info("🛑 Keyboard interrupt received, shutting down...")
@@ -218,23 +267,29 @@ class TwitterMonitor:
             self._cleanup()
 
     def _log_statistics(self):
-        """Log current monitoring statistics."""
-        total_tweets_in_db = self.database.get_tweet_count()
-
-        logger.info("📊 === TWITTER MONITORING STATISTICS ===")
-        logger.info(f"🏃 Runtime: {self.stats.get_runtime_seconds()}s")
-        logger.info(f"📥 Tweets fetched this session: {self.stats.total_tweets_fetched}")
-        logger.info(f"💾 New tweets stored this session: {self.stats.new_tweets_saved}")
-        logger.info(f"📊 Total tweets in database: {total_tweets_in_db}")
-        logger.info(f"⚠️ Errors encountered: {self.stats.errors_count}")
-        logger.info(f"🚫 Rate limit hits: {self.stats.rate_limit_hits}")
-        logger.info(f"📈 Average tweets per minute: {self.stats.get_tweets_per_minute():.1f}")
-        logger.info(f"🏷️ Hashtags monitored: {', '.join([f'#{tag}' for tag in self.stats.hashtags_monitored])}")
-
-        if self.stats.last_tweet_id:
-            logger.info(f"🆔 Latest tweet ID: {self.stats.last_tweet_id}")
-
-        logger.info("=======================================")
+        """Log current monitoring statistics as a single multi-line record."""
+        # Skips the table estimate query as well when INFO is filtered out
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        total_tweets_in_db = self.database.get_tweet_count_estimate()
+        hashtags = ', '.join(f'#{tag}' for tag in self.stats.hashtags_monitored)
+        latest_id_line = f"\n🆔 Latest tweet ID: {self.stats.last_tweet_id}" if self.stats.last_tweet_id else ""
+
+        logger.info("📊 === TWITTER MONITORING STATISTICS ===\n"
+                    "🏃 Runtime: %ss\n"
+                    "📥 Tweets fetched this session: %s\n"
+                    "💾 New tweets stored this session: %s\n"
+                    "📊 Total tweets in database: ~%s\n"
+                    "⚠️ Errors encountered: %s\n"
+                    "🚫 Rate limit hits: %s\n"
+                    "📈 Average tweets per minute: %.1f\n"
+                    "🏷️ Hashtags monitored: %s%s\n"
+                    "=======================================",
+                    self.stats.get_runtime_seconds(), self.stats.total_tweets_fetched,
+                    self.stats.new_tweets_saved, total_tweets_in_db, self.stats.errors_count,
+                    self.stats.rate_limit_hits, self.stats.get_tweets_per_minute(),
+                    hashtags, latest_id_line)
 
     def _cleanup(self):
         """Clean up resources."""
@@ -243,6 +298,10 @@ class TwitterMonitor:
         # Log final statistics
         self._log_statistics()
 
+        # Close pooled X API connections
+        if self.client:
+            self.client.close()
+
         # Close database connection
         if self.database:
             self.database.disconnect()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for mapping Reddit listing data to backfill insert rows."""
+
+import importlib.util
+import os
+import sys
+import unittest
+sys.path.append(os.path.dirname(__file__))
+
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ('psycopg2', 'requests', 'dotenv', 'pydantic'))
+
+if HAS_DEPENDENCIES:
+    from backfill_historical import extract_insert_tuple
+    from src.database import POST_COLUMNS
+    from src.reddit_client import PERMALINK_PREFIX
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "requires the packages in requirements.txt")
+class ExtractInsertTupleTest(unittest.TestCase):
+    """extract_insert_tuple fast path and missing-field fallback."""
+
+    FULL_POST = {
+        'id': 'abc123',
+        'title': 'Galaxy S24 review',
+        'author': 'someone',
+        'created_utc': 1700000000.0,
+        'score': 42,
+        'num_comments': 7,
+        'url': 'https://example.com',
+        'selftext': 'body',
+        'permalink': '/r/samsung/comments/abc123/galaxy/',
+        'subreddit': 'samsung',
+        'ups': 42,  # Extra listing fields are ignored
+    }
+
+    def test_full_listing_in_column_order(self):
+        row = extract_insert_tuple(self.FULL_POST)
+        self.assertEqual(len(row), len(POST_COLUMNS))
+        self.assertEqual(row, ('abc123', 'Galaxy S24 review', 'someone', 1700000000, 42, 7,
+                               'https://example.com', 'body',
+                               PERMALINK_PREFIX + '/r/samsung/comments/abc123/galaxy/', 'samsung'))
+        self.assertIsInstance(row[POST_COLUMNS.index('created_utc')], int)
+
+    def test_missing_fields_fall_back_to_defaults(self):
+        post = {'id': 'def456', 'title': 'Deleted post', 'created_utc': 1700000001}
+        row = dict(zip(POST_COLUMNS, extract_insert_tuple(post)))
+        self.assertEqual(row['post_id'], 'def456')
+        self.assertEqual(row['author'], '[deleted]')
+        self.assertEqual(row['score'], 0)
+        self.assertEqual(row['num_comments'], 0)
+        self.assertEqual(row['permalink'], '')
+
+
+if __name__ == "__main__":
+    unittest.main()
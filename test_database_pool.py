@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Tests for reconnecting after a pooled database connection was dropped."""
+
+import importlib.util
+import os
+import sys
+import time
+import unittest
+sys.path.append(os.path.dirname(__file__))
+
+HAS_PSYCOPG2 = importlib.util.find_spec('psycopg2') is not None
+
+if HAS_PSYCOPG2:
+    import psycopg2
+    from src.database import Database
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        # psycopg2's default
+        self.itersize = 2000
+
+    def execute(self, query, params=None):
+        if self.connection.dropped:
+            self.connection.closed = 2
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.connection.executed.append(query)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, dropped=False):
+        self.dropped = dropped
+        self.closed = 0
+        self.executed = []
+        self.cursors = []
+        self.committed = False
+        self.last_used = time.monotonic()
+
+    def cursor(self, **kwargs):
+        self.cursors.append(FakeCursor(self))
+        return self.cursors[-1]
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    def __init__(self, connections):
+        self.idle = list(connections)
+        self.discarded = []
+        self.returned = []
+
+    def getconn(self):
+        return self.idle.pop(0)
+
+    def putconn(self, connection, close=False):
+        (self.discarded if close else self.returned).append(connection)
+
+
+@unittest.skipUnless(HAS_PSYCOPG2, "requires psycopg2")
+class ReconnectTest(unittest.TestCase):
+    """A connection that died in the pool is replaced once before any statement succeeds."""
+
+    def _database(self, *connections):
+        database = Database(port=5432, idle_ping_seconds=3600)
+        database.pool = FakePool(connections)
+        return database
+
+    def test_first_statement_retried_on_fresh_connection(self):
+        dead, fresh = FakeConnection(dropped=True), FakeConnection()
+        database = self._database(dead, fresh)
+
+        with database.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.fetchone(), (1,))
+
+        self.assertEqual(database.pool.discarded, [dead])
+        self.assertEqual(database.pool.returned, [fresh])
+        self.assertEqual(fresh.executed, ["SELECT 1"])
+        self.assertTrue(fresh.committed)
+
+    def test_attribute_writes_reach_the_cursor(self):
+        connection = FakeConnection()
+        database = self._database(connection)
+
+        with database.cursor(name='stats') as cursor:
+            cursor.itersize = 1000
+            cursor.execute("SELECT 1")
+
+        self.assertEqual(connection.cursors[0].itersize, 1000)
+
+    def test_attribute_writes_survive_a_reconnect(self):
+        dead, fresh = FakeConnection(dropped=True), FakeConnection()
+        database = self._database(dead, fresh)
+
+        with database.cursor(name='stats') as cursor:
+            cursor.itersize = 1000
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.itersize, 1000)
+
+        self.assertEqual(fresh.cursors[0].itersize, 1000)
+
+    def test_failure_after_a_statement_succeeded_is_not_retried(self):
+        connection, spare = FakeConnection(), FakeConnection()
+        database = self._database(connection, spare)
+
+        with self.assertRaises(psycopg2.OperationalError):
+            with database.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                connection.dropped = True
+                cursor.execute("SELECT 2")
+
+        self.assertEqual(database.pool.idle, [spare])
+        self.assertFalse(connection.committed)
+
+
+if __name__ == "__main__":
+    unittest.main()
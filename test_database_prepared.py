@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tests for the prepared-statement insert path against a posts-only schema."""
+
+import importlib.util
+import os
+import sys
+import unittest
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(__file__))
+
+HAS_PSYCOPG2 = importlib.util.find_spec('psycopg2') is not None
+
+if HAS_PSYCOPG2:
+    import psycopg2.errors
+    from src.database import Database, PooledConnection, post_row
+
+
+class PostsOnlySession:
+    """Server session state for a database that has samsung_posts but no twitter_tweets."""
+
+    def __init__(self, already_prepared=()):
+        self.server_prepared = set(already_prepared)
+        self.prepared = set()
+        self.aborted = False
+
+    # PooledConnection.prepare only uses self.prepared, so it runs unchanged on this session
+    prepare = PooledConnection.prepare if HAS_PSYCOPG2 else None
+
+
+class PostsOnlyCursor:
+    """Cursor that mimics PostgreSQL's aborted-transaction and savepoint behaviour."""
+
+    def __init__(self, session):
+        self.connection = session
+        self.executed = []
+        self._rows = []
+
+    def _fail(self, error):
+        self.connection.aborted = True
+        raise error
+
+    def execute(self, sql, params=None):
+        sql = ' '.join(sql.split())
+        self.executed.append(sql)
+        if sql.startswith('ROLLBACK TO SAVEPOINT'):
+            self.connection.aborted = False
+            return
+        if self.connection.aborted:
+            raise psycopg2.errors.InFailedSqlTransaction("current transaction is aborted")
+        if 'twitter_tweets' in sql:
+            self._fail(psycopg2.errors.UndefinedTable('relation "twitter_tweets" does not exist'))
+        if sql.startswith('PREPARE'):
+            name = sql.split()[1]
+            if name in self.connection.server_prepared:
+                self._fail(psycopg2.errors.DuplicatePreparedStatement(f'prepared statement "{name}" already exists'))
+            self.connection.server_prepared.add(name)
+        elif sql.startswith('EXECUTE'):
+            name = sql.split()[1]
+            if name not in self.connection.server_prepared:
+                self._fail(psycopg2.errors.InvalidSqlStatementName(f'prepared statement "{name}" does not exist'))
+            self._rows = [(post_id,) for post_id in params[0]]
+        elif sql.startswith('INSERT INTO samsung_posts'):
+            self._rows = [(post_id,) for post_id in params[0]]
+
+    def fetchall(self):
+        return self._rows
+
+
+@unittest.skipUnless(HAS_PSYCOPG2, "requires psycopg2")
+class PreparedInsertTest(unittest.TestCase):
+    """Prepared inserts degrade to plain SQL instead of dropping the batch."""
+
+    POST = {'post_id': 'abc123', 'title': 'Galaxy', 'author': 'someone', 'created_utc': 1700000000,
+            'score': 1, 'num_comments': 0, 'url': '', 'selftext': '', 'permalink': '', 'subreddit': 'samsung'}
+
+    def _database(self, session):
+        database = Database(port=5432, prepared_statements=True)
+        self.cursor = PostsOnlyCursor(session)
+
+        @contextmanager
+        def cursor(**kwargs):
+            yield self.cursor
+
+        database.cursor = cursor
+        return database
+
+    def test_posts_only_schema_inserts_with_prepared_statements(self):
+        session = PostsOnlySession()
+        database = self._database(session)
+
+        self.assertEqual(database.insert_posts_batch([post_row(self.POST)]), ['abc123'])
+        self.assertIn('insert_posts_stmt', session.prepared)
+        self.assertNotIn('insert_tweet_stmt', session.prepared)
+        self.assertTrue(any(sql.startswith('EXECUTE insert_posts_stmt') for sql in self.cursor.executed))
+        self.assertFalse(session.aborted)
+
+    def test_failed_prepare_rolls_back_and_requests_fallback(self):
+        session = PostsOnlySession()
+        database = self._database(session)
+
+        self.assertIsNone(database._execute_prepared('insert_tweet_stmt', [1] * 17))
+        self.assertFalse(session.aborted)
+        self.assertNotIn('insert_tweet_stmt', session.prepared)
+        # Only that statement failed; posts keep using the prepared path
+        self.assertTrue(database.prepared_statements)
+        self.assertEqual(database.insert_posts_batch([post_row(self.POST)]), ['abc123'])
+
+    def test_statement_already_prepared_on_server_session(self):
+        session = PostsOnlySession(already_prepared={'insert_posts_stmt'})
+        database = self._database(session)
+
+        self.assertEqual(database.insert_posts_batch([post_row(self.POST)]), ['abc123'])
+        self.assertIn('insert_posts_stmt', session.prepared)
+        self.assertFalse(session.aborted)
+
+
+if __name__ == "__main__":
+    unittest.main()
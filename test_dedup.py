@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Tests for the in-memory post ID dedup helpers."""
+
+import os
+import sys
+import unittest
+sys.path.append(os.path.dirname(__file__))
+
+from src.bloom_filter import BloomFilter
+from src.recent_ids import RecentIds
+
+
+class BloomFilterTest(unittest.TestCase):
+    """BloomFilter membership and false positive rate."""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(expected=1_000, fp_rate=0.01)
+        ids = [f"t3_{i:x}" for i in range(1_000)]
+        for post_id in ids:
+            bloom.add(post_id)
+        self.assertTrue(all(post_id in bloom for post_id in ids))
+        self.assertEqual(len(bloom), 1_000)
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(expected=10_000, fp_rate=0.01)
+        for i in range(10_000):
+            bloom.add(f"present-{i}")
+        false_positives = sum(f"absent-{i}" in bloom for i in range(20_000))
+        # Target is 1%; allow generous slack for hash variance
+        self.assertLess(false_positives / 20_000, 0.02)
+
+    def test_empty_filter_contains_nothing(self):
+        bloom = BloomFilter(expected=100)
+        self.assertNotIn("abc123", bloom)
+
+
+class RecentIdsTest(unittest.TestCase):
+    """RecentIds LRU eviction."""
+
+    def test_evicts_least_recently_seen(self):
+        recent = RecentIds(maxlen=3)
+        for post_id in ("a", "b", "c"):
+            recent.add(post_id)
+        self.assertIn("a", recent)  # Lookup refreshes "a"; "b" is now the oldest
+        recent.add("d")
+        self.assertNotIn("b", recent)
+        self.assertIn("a", recent)
+        self.assertIn("c", recent)
+        self.assertIn("d", recent)
+        self.assertEqual(len(recent), 3)
+
+    def test_re_adding_refreshes_without_growing(self):
+        recent = RecentIds(maxlen=2)
+        recent.add("a")
+        recent.add("b")
+        recent.add("a")
+        recent.add("c")
+        self.assertEqual(len(recent), 2)
+        self.assertIn("a", recent)
+        self.assertNotIn("b", recent)
+
+
+if __name__ == "__main__":
+    unittest.main()
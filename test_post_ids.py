@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Tests for the base36 post ID codec used to store Reddit IDs as BIGINT."""
+
+import importlib.util
+import os
+import sys
+import unittest
+sys.path.append(os.path.dirname(__file__))
+
+HAS_PSYCOPG2 = importlib.util.find_spec('psycopg2') is not None
+
+if HAS_PSYCOPG2:
+    from src.database import decode_post_id, encode_post_id
+
+
+@unittest.skipUnless(HAS_PSYCOPG2, "requires psycopg2")
+class PostIdCodecTest(unittest.TestCase):
+    """decode_post_id and encode_post_id are exact inverses."""
+
+    def test_round_trip(self):
+        for post_id in ('0', '1', 'z', '10', '1abcde', 'zzzzzzzzzzzz', '1y2p0ij32e8e7'):
+            with self.subTest(post_id=post_id):
+                self.assertEqual(encode_post_id(decode_post_id(post_id)), post_id)
+
+    def test_known_values(self):
+        self.assertEqual(decode_post_id('0'), 0)
+        self.assertEqual(decode_post_id('z'), 35)
+        self.assertEqual(decode_post_id('10'), 36)
+        self.assertEqual(encode_post_id(0), '0')
+
+    def test_largest_bigint(self):
+        # Longest ID that still fits the BIGINT column
+        self.assertEqual(decode_post_id('1y2p0ij32e8e7'), 2 ** 63 - 1)
+        self.assertEqual(encode_post_id(2 ** 63 - 1), '1y2p0ij32e8e7')
+
+    def test_uppercase_decodes_like_lowercase(self):
+        self.assertEqual(decode_post_id('ABC'), decode_post_id('abc'))
+
+    def test_invalid_ids_raise(self):
+        for post_id in ('', 'abc-1', 't3_abc', ' abc', 'ab c', 'é'):
+            with self.subTest(post_id=post_id):
+                with self.assertRaises(ValueError):
+                    decode_post_id(post_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Tests for the shared Reddit request rate limiter."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+sys.path.append(os.path.dirname(__file__))
+
+from src.rate_limiter import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    """RateLimiter token bucket and header handling."""
+
+    def test_burst_then_throttle(self):
+        limiter = RateLimiter(requests_per_minute=600, burst=2)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        # Third request waits for one token at 10 requests/second
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_header_update_not_blocked_by_waiting_acquire(self):
+        limiter = RateLimiter(requests_per_minute=6, burst=1)
+        limiter.acquire()  # Bucket is now empty; the next token is ~10s away
+
+        waiter = threading.Thread(target=limiter.acquire, daemon=True)
+        waiter.start()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        limiter.update_from_headers({'X-Ratelimit-Remaining': '1', 'X-Ratelimit-Used': '99',
+                                     'X-Ratelimit-Reset': '30'})
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertGreater(limiter._blocked_until, time.monotonic() + 20)
+        self.assertTrue(waiter.is_alive())
+
+    def test_malformed_headers_ignored(self):
+        limiter = RateLimiter()
+        limiter.update_from_headers({'X-Ratelimit-Remaining': 'n/a', 'X-Ratelimit-Reset': '10'})
+        self.assertIsNone(limiter.remaining)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Tests for pacing X searches across several bearer tokens."""
+
+import importlib.util
+import os
+import sys
+import time
+import unittest
+sys.path.append(os.path.dirname(__file__))
+
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ('requests', 'orjson', 'pydantic'))
+
+if HAS_DEPENDENCIES:
+    from src.twitter_client import TwitterClient
+
+
+class FakeResponse:
+    """Search response carrying only a status code and rate limit headers."""
+
+    def __init__(self, remaining, reset, status_code=200):
+        self.status_code = status_code
+        self.headers = {
+            'x-rate-limit-limit': '60',
+            'x-rate-limit-remaining': str(remaining),
+            'x-rate-limit-reset': str(reset),
+        }
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "requires the packages in requirements.txt")
+class NextPollDelayTest(unittest.TestCase):
+    """next_poll_delay spreads the quota of every usable token over the window."""
+
+    def setUp(self):
+        self.client = TwitterClient('A', bearer_tokens=['A', 'B'])
+        self.now = int(time.time())
+
+    def test_exhausted_token_does_not_stall_the_other(self):
+        self.client._record_rate_limit(FakeResponse(0, self.now + 900), 'A')
+        self.client._record_rate_limit(FakeResponse(59, self.now + 900), 'B')
+
+        # 59 polls left on B: pace them over the window, not wait for A's reset
+        self.assertAlmostEqual(self.client.next_poll_delay(1), 900 / 58, delta=1)
+
+    def test_remaining_requests_are_summed_over_tokens(self):
+        self.client._record_rate_limit(FakeResponse(10, self.now + 900), 'A')
+        self.client._record_rate_limit(FakeResponse(20, self.now + 900), 'B')
+
+        self.assertAlmostEqual(self.client.next_poll_delay(1), 900 / 29, delta=1)
+
+    def test_waits_for_first_reset_when_every_token_is_exhausted(self):
+        self.client._record_rate_limit(FakeResponse(0, self.now + 900), 'A')
+        self.client._record_rate_limit(FakeResponse(0, self.now + 300, status_code=429), 'B')
+
+        self.assertAlmostEqual(self.client.next_poll_delay(1), 300, delta=1)
+
+    def test_unreported_token_uses_min_interval(self):
+        self.client._record_rate_limit(FakeResponse(1, self.now + 900), 'A')
+
+        self.assertEqual(self.client.next_poll_delay(120), 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
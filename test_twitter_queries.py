@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Tests for splitting monitored hashtags into X recent-search queries."""
+
+import importlib.util
+import os
+import sys
+import unittest
+sys.path.append(os.path.dirname(__file__))
+
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ('requests', 'orjson', 'pydantic'))
+
+if HAS_DEPENDENCIES:
+    from src.twitter_client import MAX_QUERY_LENGTH, _build_queries
+
+
+def _terms(queries):
+    """Hashtags in query order, without the leading '#'."""
+    return [term[1:] for query in queries for term in query.split(" OR ")]
+
+
+@unittest.skipUnless(HAS_DEPENDENCIES, "requires the packages in requirements.txt")
+class BuildQueriesTest(unittest.TestCase):
+    """_build_queries keeps every hashtag and respects MAX_QUERY_LENGTH."""
+
+    def test_short_list_is_one_query(self):
+        self.assertEqual(_build_queries(("samsung", "galaxy")), ("#samsung OR #galaxy",))
+
+    def test_empty_list_has_no_queries(self):
+        self.assertEqual(_build_queries(()), ())
+
+    def test_long_list_splits_without_dropping_hashtags(self):
+        hashtags = tuple(f"hashtag{i:03d}" for i in range(200))
+        queries = _build_queries(hashtags)
+        self.assertGreater(len(queries), 1)
+        self.assertTrue(all(len(query) <= MAX_QUERY_LENGTH for query in queries))
+        self.assertEqual(_terms(queries), list(hashtags))
+
+    def test_exact_fit_stays_in_one_query(self):
+        # "#<first> OR #b" is exactly MAX_QUERY_LENGTH long; one more character must split it
+        first = "a" * (MAX_QUERY_LENGTH - len(" OR #b") - 1)
+        queries = _build_queries((first, "b"))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(queries[0]), MAX_QUERY_LENGTH)
+        self.assertEqual(len(_build_queries((first, "bc"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()